@@ -0,0 +1,10 @@
+from extensions import db
+from app import app
+from models import ChatMessage, Feedback, FinishedFeedback, LoginLog, User
+
+with app.app_context():
+    # db.create_all() does not add indexes to tables that already exist
+    for model in (ChatMessage, Feedback, FinishedFeedback, LoginLog, User):
+        for index in model.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+            print(f"Ensured index {index.name} on {index.table.name}")
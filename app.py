@@ -1,16 +1,31 @@
 import os
+import functools
 import logging
 import re
 import json
+import time
+import threading
+import hashlib
+import uuid
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby, repeat
+from operator import attrgetter
 from datetime import datetime, timedelta
 from flask import (
-    Flask, render_template, request, jsonify, session, redirect, url_for, flash, make_response
+    Flask, render_template, request, jsonify, session, redirect, url_for, flash, make_response,
+    Response, stream_with_context
 )
 from flask_login import (
     LoginManager, login_user, logout_user, login_required, current_user
 )
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.orm import Session as OrmSession, load_only, scoped_session, sessionmaker
 
 
 # Configure logging
@@ -19,20 +34,65 @@ logging.basicConfig(level=logging.INFO)
 # Import custom modules
 from chatbot import Chatbot
 from user_management import UserManager
-from models import Admin, User as UserModel, LoginLog
+from models import Admin, ChatMessage, Feedback, FinishedFeedback, LoginLog, User as UserModel
+from chatbot_models import Faq, Location, Visual
 from extensions import db
 from database import email_directory
+from database.user_database import rule_utils
 from update_chatbot import ChatbotDB
 
+# Login lookups built once so SQLAlchemy's compiled-statement cache is reused across requests
+_LOGIN_BY_USERNAME = select(UserModel).where(UserModel.username == bindparam('v'))
+_LOGIN_BY_EMAIL = select(UserModel).where(UserModel.email == bindparam('v'))
+_ADMIN_BY_EMAIL = select(Admin).where(Admin.email == bindparam('v'))
+
+# Fixed-shape admin writes, likewise built once; nothing they touch is held in the
+# session, so they skip the ORM's synchronize step
+# (Core insert against the table: an ORM insert executed with parameters is treated as a bulk insert)
+_ARCHIVE_FEEDBACK = insert(FinishedFeedback.__table__).from_select(
+    ['feedback_id', 'user_id', 'message', 'timestamp'],
+    select(Feedback.id, Feedback.user_id, Feedback.message, Feedback.timestamp)
+    .where(Feedback.id == bindparam('id'))
+)
+_DELETE_FEEDBACK = delete(Feedback).where(Feedback.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_LOGIN_LOG = delete(LoginLog).where(LoginLog.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_FAQ = delete(Faq).where(Faq.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_LOCATION = delete(Location).where(Location.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_VISUAL = delete(Visual).where(Visual.id == bindparam('id')).execution_options(synchronize_session=False)
+
+# Signup emails must belong to the wvsu.edu.ph domain
+_WVSU_EMAIL_RE = re.compile(r'^[^@]+@wvsu\.edu\.ph\Z')
+_MULTI_DOT_RE = re.compile(r'\.+')
+
+class _FaviconShortcut:
+    """
+    WSGI middleware that answers /favicon.ico with 204 No Content before Flask
+    builds a request context, so no session decoding or user loading happens.
+    """
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == '/favicon.ico':
+            start_response('204 No Content', [('Content-Length', '0')])
+            return [b'']
+        return self.wsgi_app(environ, start_response)
+
 app = Flask(__name__)
+app.wsgi_app = _FaviconShortcut(app.wsgi_app)
 app.template_folder = 'htdocs'
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
+# Responses are built from dicts in a fixed order; skip jsonify's per-object key
+# sort and the \u-escaping of non-ASCII text (bodies are sent as UTF-8 anyway)
+app.json.sort_keys = False
+app.json.ensure_ascii = False
 
 def get_database_urls():
     """Get database URLs at runtime to ensure environment variables are available"""
-    # Debug: Log all MySQL-related environment variables
-    mysql_env_vars = {k: v for k, v in os.environ.items() if 'mysql' in k.lower() or 'database' in k.lower()}
-    app.logger.info(f"Available MySQL/Database environment variables: {mysql_env_vars}")
+    # Debug: Log all MySQL-related environment variables (only scan the environment when debugging)
+    if app.logger.isEnabledFor(logging.DEBUG):
+        mysql_env_vars = {k: v for k, v in os.environ.items() if 'mysql' in k.lower() or 'database' in k.lower()}
+        app.logger.debug(f"Available MySQL/Database environment variables: {mysql_env_vars}")
 
     # Add SQLAlchemy configuration for MySQL
     mysql_url = os.environ.get('MYSQL_URL')
@@ -63,14 +123,17 @@ def get_database_urls():
         app.logger.warning("Railway MySQL environment variables not complete")
         return None
 
+    # Construct the Railway URL once and reuse it for both databases
+    railway_url = construct_railway_mysql_url('railway')
+
     # Determine user database URL - prioritize Railway/production databases
     if os.environ.get('DATABASE_URL'):
         # Use explicit DATABASE_URL if provided (Railway/production)
         user_db_url = os.environ.get('DATABASE_URL')
         app.logger.info("Using DATABASE_URL for user database")
-    elif construct_railway_mysql_url():
+    elif railway_url:
         # Construct URL from Railway environment variables (Railway/production)
-        user_db_url = construct_railway_mysql_url('railway')
+        user_db_url = railway_url
         app.logger.info("Using Railway MySQL for user database")
     elif mysql_url:
         # Use MYSQL_URL if provided (other production environments)
@@ -87,9 +150,9 @@ def get_database_urls():
         # Use explicit CHATBOT_DATABASE_URL if provided (Railway/production)
         chatbot_db_url = os.environ.get('CHATBOT_DATABASE_URL')
         app.logger.info("Using CHATBOT_DATABASE_URL for chatbot database")
-    elif construct_railway_mysql_url():
+    elif railway_url:
         # Construct URL from Railway environment variables (Railway/production)
-        chatbot_db_url = construct_railway_mysql_url('railway')
+        chatbot_db_url = railway_url
         app.logger.info("Using Railway MySQL for chatbot database")
     else:
         # Fallback to SQLite for development/local testing only
@@ -108,12 +171,13 @@ app.config['CHATBOT_DATABASE_URI'] = chatbot_db_url
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SQLALCHEMY_ECHO'] = False  # Disable SQL echo for cleaner logs
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+# Shared engine options for both the user database and the chatbot database
+_ENGINE_OPTS = {
     'pool_pre_ping': True,  # Check connection before using
-    'pool_recycle': 300,    # Recycle connections after 5 minutes (more aggressive for Railway)
-    'pool_size': 1,         # Very small pool size for reliability
-    'max_overflow': 1,      # Minimal overflow connections
-    'pool_timeout': 60,     # Longer timeout for Railway
+    'pool_recycle': 3600,   # Recycle connections every hour
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 20,
     'pool_reset_on_return': 'rollback',  # Reset connections on return to pool
     'connect_args': {
         'connect_timeout': 20,  # Increased timeout
@@ -122,54 +186,159 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
         'autocommit': True,     # Enable autocommit for better reliability
     }
 }
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(_ENGINE_OPTS)
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('mysql'):
+    # The connect_args above are PyMySQL-specific
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].pop('connect_args')
+
+# Flask-SQLAlchemy does not apply SQLALCHEMY_ENGINE_OPTIONS to binds, so the
+# chatbot database gets its own pool settings (recycled sooner than the user DB)
+_CHATBOT_ENGINE_OPTS = dict(_ENGINE_OPTS, pool_recycle=1800, pool_timeout=30,
+                            insertmanyvalues_page_size=1000)  # rows per multi-VALUES INSERT
+if not app.config['CHATBOT_DATABASE_URI'].startswith('mysql'):
+    # The connect_args above are PyMySQL-specific
+    _CHATBOT_ENGINE_OPTS.pop('connect_args')
 
 # Configure binds for multiple databases
 app.config['SQLALCHEMY_BINDS'] = {
-    'chatbot_db': app.config['CHATBOT_DATABASE_URI']
+    'chatbot_db': dict(_CHATBOT_ENGINE_OPTS, url=app.config['CHATBOT_DATABASE_URI'])
 }
 
-# Create separate engine for chatbot database
-from sqlalchemy import create_engine
-chatbot_engine = create_engine(app.config['CHATBOT_DATABASE_URI'], **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
-
-# Connection pool settings to handle connection drops
-app.config['SQLALCHEMY_POOL_SIZE'] = 10
-app.config['SQLALCHEMY_MAX_OVERFLOW'] = 20
-app.config['SQLALCHEMY_POOL_TIMEOUT'] = 30
-app.config['SQLALCHEMY_POOL_RECYCLE'] = 3600  # Recycle connections every hour
-app.config['SQLALCHEMY_POOL_PRE_PING'] = True  # Check connection before use
-
 # File upload configuration
 app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'static', 'uploads', 'locations')
 app.config['VISUALS_UPLOAD_FOLDER'] = os.path.join(app.root_path, 'static', 'uploads', 'visuals')
 app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in app.config['ALLOWED_EXTENSIONS'])
 
 def allowed_file(filename):
     """
     Check if the uploaded file has an allowed extension.
     """
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+# Create the upload folders once at startup instead of per uploaded file
+for _upload_folder in (app.config['UPLOAD_FOLDER'], app.config['VISUALS_UPLOAD_FOLDER']):
+    os.makedirs(_upload_folder, exist_ok=True)
+
+_UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+def _spool_upload(file, folder, filename=None):
+    """
+    Stream an uploaded file to a temporary file in folder, hashing it on the way.
+    Returns (tmp_path, stored_name); _store_spooled moves it into place.
+    filename overrides the sanitized client filename the extension is taken from.
+    """
+    ext = os.path.splitext(filename or secure_filename(file.filename))[1].lower()
+    tmp_path = os.path.join(folder, f".upload-{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
+    try:
+        # Copy in 1MB chunks rather than FileStorage.save()'s 16KB default
+        with open(tmp_path, 'wb', buffering=_UPLOAD_BUFFER_SIZE) as out:
+            while chunk := file.stream.read(_UPLOAD_BUFFER_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return tmp_path, f"{digest.hexdigest()}{ext}"
+
+def _store_spooled(tmp_path, folder, stored_name):
+    """
+    Rename a spooled upload to its content-addressed name, or drop it if that file already exists.
+    """
+    final_path = os.path.join(folder, stored_name)
+    if os.path.exists(final_path):
+        os.unlink(tmp_path)
+    else:
+        os.replace(tmp_path, final_path)
+    return stored_name
+
+def _save_upload(file, folder, filename=None):
+    """
+    Stream an uploaded file into folder and return its stored name.
+    Files are named by the SHA-256 of their content, so an identical re-upload
+    reuses the existing file.
+    """
+    tmp_path, stored_name = _spool_upload(file, folder, filename)
+    try:
+        return _store_spooled(tmp_path, folder, stored_name)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+# Multi-file uploads are written in parallel; the copy loop releases the GIL on I/O
+_upload_executor = ThreadPoolExecutor(max_workers=4)
+
+def _save_uploads(files, folder, filenames=None):
+    """
+    Save already-validated uploads into folder and return their stored names in order.
+    """
+    if len(files) <= 1:
+        return [_save_upload(f, folder, n) for f, n in zip(files, filenames or repeat(None))]
+    return list(_upload_executor.map(_save_upload, files, repeat(folder), filenames or repeat(None)))
+
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Use WAL journaling and memory-mapped reads on the SQLite fallback so readers don't block the writer.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB
+    cursor.close()
 
 db.init_app(app)
 
+# Reuse the engine (and connection pool) Flask-SQLAlchemy created for the
+# chatbot_db bind instead of opening a second pool to the same database
+with app.app_context():
+    chatbot_engine = db.engines['chatbot_db']
+
+# One thread-local session factory for the chatbot database, shared by the
+# admin views; the session is handed back to the pool when the request ends
+ChatbotSession = scoped_session(sessionmaker(bind=chatbot_engine, expire_on_commit=False))
+
+@app.teardown_appcontext
+def remove_chatbot_session(exception=None):
+    ChatbotSession.remove()
+
 # Initialize login manager
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+def _has_missing_tables():
+    """
+    Check whether any model table is missing from its database (default or bound).
+    """
+    for bind_key, metadata in db.metadatas.items():
+        existing_tables = set(inspect(db.engines[bind_key]).get_table_names())
+        if any(table_name not in existing_tables for table_name in metadata.tables):
+            return True
+    return False
+
 with app.app_context():
     # Retry database table creation up to 5 times with exponential backoff
     max_retries = 5
     for attempt in range(max_retries):
         try:
-            db.create_all()
-            app.logger.info("Database tables created successfully")
+            # Warm restarts already have every table, so skip create_all entirely
+            if _has_missing_tables():
+                db.create_all()
+                app.logger.info("Database tables created successfully")
+            else:
+                app.logger.info("Database tables already exist, skipping create_all")
             break  # Success, exit retry loop
         except Exception as e:
             app.logger.warning(f"Database table creation attempt {attempt + 1} failed: {str(e)}")
             if attempt < max_retries - 1:
-                import time
                 delay = 2 ** attempt  # Exponential backoff: 1, 2, 4, 8 seconds
                 app.logger.info(f"Retrying in {delay} seconds...")
                 time.sleep(delay)
@@ -182,10 +351,22 @@ with app.app_context():
     user_manager = UserManager(db)
 
 # Auto-upload JSON files to Railway volume on startup
+def _iter_json_files(path):
+    """
+    Recursively yield os.DirEntry objects for every .json file under path.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_json_files(entry.path)
+            elif entry.name.endswith('.json') and entry.is_file():
+                yield entry
+
 def auto_upload_json_files():
     """
     Automatically copy JSON files from local database directory to Railway volume (/app/database)
-    if the volume is mounted and writable.
+    if the volume is mounted and writable. Files whose size and mtime already match on the
+    volume are skipped.
     """
     import shutil
 
@@ -197,32 +378,44 @@ def auto_upload_json_files():
         app.logger.info("Railway volume detected at /app/database, copying JSON files...")
 
         # Ensure volume subdirectories exist
+        created_dirs = set()
         for subdir in ['user_database', 'guest_database', 'visuals', 'locations', 'feedback']:
             vol_subdir = os.path.join(volume_path, subdir)
             os.makedirs(vol_subdir, exist_ok=True)
+            created_dirs.add(vol_subdir)
 
         # Copy all JSON files from local database to volume
-        for root, dirs, files in os.walk(local_db_path):
-            for file in files:
-                if file.endswith('.json'):
-                    local_file = os.path.join(root, file)
-                    # Get relative path from database directory
-                    rel_path = os.path.relpath(local_file, local_db_path)
-                    volume_file = os.path.join(volume_path, rel_path)
-
-                    # Skip if source and destination are the same file (Railway volume mount)
-                    if os.path.abspath(local_file) == os.path.abspath(volume_file):
-                        app.logger.info(f"Skipping copy for {rel_path}: source and destination are the same")
-                        continue
-
-                    try:
-                        # Ensure destination directory exists
-                        os.makedirs(os.path.dirname(volume_file), exist_ok=True)
-                        # Copy file
-                        shutil.copy2(local_file, volume_file)
-                        app.logger.info(f"Copied {rel_path} to volume")
-                    except Exception as e:
-                        app.logger.error(f"Failed to copy {rel_path}: {str(e)}")
+        for entry in _iter_json_files(local_db_path):
+            local_file = entry.path
+            # Get relative path from database directory
+            rel_path = os.path.relpath(local_file, local_db_path)
+            volume_file = os.path.join(volume_path, rel_path)
+
+            # Skip if source and destination are the same file (Railway volume mount)
+            if os.path.abspath(local_file) == os.path.abspath(volume_file):
+                app.logger.info(f"Skipping copy for {rel_path}: source and destination are the same")
+                continue
+
+            try:
+                # Skip files that are already up to date on the volume
+                src_stat = entry.stat()
+                try:
+                    dst_stat = os.stat(volume_file)
+                except FileNotFoundError:
+                    dst_stat = None
+                if dst_stat and dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime >= src_stat.st_mtime:
+                    continue
+
+                # Ensure destination directory exists
+                volume_dir = os.path.dirname(volume_file)
+                if volume_dir not in created_dirs:
+                    os.makedirs(volume_dir, exist_ok=True)
+                    created_dirs.add(volume_dir)
+                # Copy file
+                shutil.copy2(local_file, volume_file)
+                app.logger.info(f"Copied {rel_path} to volume")
+            except Exception as e:
+                app.logger.error(f"Failed to copy {rel_path}: {str(e)}")
 
         # Update chatbot to use volume paths if available
         if os.path.exists(volume_path):
@@ -242,13 +435,14 @@ with app.app_context():
         """
         try:
             # Check if chatbot database tables are empty
-            from chatbot_models import Faq, Location, Visual
-            faq_count = Faq.query.count()
-            location_count = Location.query.count()
-            visual_count = Visual.query.count()
+            # Single round trip; EXISTS stops at the first row instead of counting them all
+            has_data = db.session.execute(
+                select(or_(select(Faq.id).exists(), select(Location.id).exists(), select(Visual.id).exists())),
+                bind_arguments={'mapper': Faq}
+            ).scalar()
 
             # If tables are empty, run migration
-            if faq_count == 0 and location_count == 0 and visual_count == 0:
+            if not has_data:
                 app.logger.info("Database tables appear empty, running JSON to database migration...")
 
                 # Import migration functions
@@ -291,6 +485,36 @@ with app.app_context():
         app.logger.error(f"Auto-migration failed: {str(e)}")
         app.logger.info("Continuing with app startup despite migration failure")
 
+    def import_finished_feedback_json():
+        """
+        Move finished feedback from the legacy feedback.json file into the FinishedFeedback table.
+        """
+        feedback_json_path = os.path.join(app.root_path, 'database', 'feedback', 'feedback.json')
+        if not os.path.exists(feedback_json_path):
+            return
+
+        try:
+            with open(feedback_json_path, 'r', encoding='utf-8') as f:
+                legacy_feedback = json.load(f)
+            db.session.add_all([
+                FinishedFeedback(
+                    feedback_id=fb['id'],
+                    user_id=fb.get('user_id'),
+                    message=fb['message'],
+                    timestamp=datetime.fromisoformat(fb['timestamp'])
+                )
+                for fb in legacy_feedback
+            ])
+            db.session.commit()
+            # Keep the old file around, but make sure it is only imported once
+            os.replace(feedback_json_path, feedback_json_path + '.imported')
+            app.logger.info(f"Imported {len(legacy_feedback)} finished feedback entries from feedback.json")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Failed to import finished feedback from feedback.json: {str(e)}")
+
+    import_finished_feedback_json()
+
     try:
         chatbot = Chatbot()  # Rules are now loaded from MySQL automatically
         app.logger.info("Chatbot initialized successfully")
@@ -316,7 +540,7 @@ def load_user(user_id):
         def load_user_operation():
             user_type = session.get('user_type')
             if user_type == 'admin':
-                admin = Admin.query.get(int(user_id))
+                admin = db.session.get(Admin, int(user_id))
                 if admin:
                     return admin
             elif user_type == 'user':
@@ -341,15 +565,139 @@ def is_admin(user):
         return True
     return False
 
+def admin_required(view):
+    """
+    Require a logged-in admin for a JSON endpoint; others get the usual error payload.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Anonymous callers are turned away before any admin lookup, and with JSON
+        # rather than login_required's redirect (which also writes a flash to the session)
+        if not current_user.is_authenticated:
+            return jsonify({'status': 'error', 'message': 'Unauthorized access'}), 401
+        if not is_admin(current_user):
+            return jsonify({'status': 'error', 'message': 'Unauthorized access'})
+        return view(*args, **kwargs)
+    return wrapper
+
+def admin_page_required(view):
+    """
+    Require a logged-in admin for an admin page; others are redirected to the chat page.
+    """
+    @functools.wraps(view)
+    @login_required
+    def wrapper(*args, **kwargs):
+        if not is_admin(current_user):
+            flash('Unauthorized access', 'danger')
+            return redirect(url_for('chat'))
+        return view(*args, **kwargs)
+    return wrapper
+
+# Admin dashboard badge counts; a few seconds of staleness is fine for badges
+_dashboard_counts_cache = {'ts': 0.0, 'val': None}
+
+def _get_dashboard_counts(ttl=10.0):
+    """
+    Return (pending_accounts, pending_feedbacks), recomputing at most once every ttl seconds.
+    """
+    now = time.monotonic()
+    if _dashboard_counts_cache['val'] is None or now - _dashboard_counts_cache['ts'] > ttl:
+        pending_accounts = user_manager.count_pending_users()
+        pending_feedbacks = db.session.query(func.count(Feedback.id)).scalar()
+        _dashboard_counts_cache['val'] = (pending_accounts, pending_feedbacks)
+        _dashboard_counts_cache['ts'] = now
+    return _dashboard_counts_cache['val']
+
+def _invalidate_dashboard_counts():
+    """
+    Drop the cached dashboard counts after a signup, approval, rejection or feedback change.
+    """
+    _dashboard_counts_cache['val'] = None
+
+# Background writer for append-only login audit records
+_login_log_executor = ThreadPoolExecutor(max_workers=2)
+
+def _write_login_log(flask_app, user_type, identifier):
+    """
+    Persist a LoginLog entry in its own app context (runs on the login log executor).
+    """
+    with flask_app.app_context():
+        try:
+            db.session.add(LoginLog(user_type=user_type, identifier=identifier))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            flask_app.logger.error(f"Failed to write login log for {identifier}: {str(e)}")
+
+# Chatbot reloads run off the request path on a single worker; a kind that is
+# already queued is not queued again, so bursts of admin edits coalesce
+_chatbot_reload_executor = ThreadPoolExecutor(max_workers=1)
+_chatbot_reload_lock = threading.Lock()
+_chatbot_reload_pending = set()
+_CHATBOT_RELOADERS = {
+    'faqs': 'reload_faqs',
+    'locations': 'reload_location_rules',
+    'visuals': 'reload_visual_rules',
+    # Refits the rule index once after a burst of changes, so chat requests don't pay for it
+    'index': 'rule_index',
+}
+
+def _run_chatbot_reload(flask_app, kind):
+    """
+    Reload one kind of chatbot data in its own app context (runs on the reload executor).
+    """
+    with _chatbot_reload_lock:
+        # Clear first so an edit committed while we reload schedules another pass
+        _chatbot_reload_pending.discard(kind)
+    with flask_app.app_context():
+        try:
+            getattr(chatbot, _CHATBOT_RELOADERS[kind])()
+        except Exception as e:
+            flask_app.logger.error(f"Failed to reload chatbot {kind}: {str(e)}")
+    if kind != 'index':
+        # Queued behind any reloads still pending, so the index is refit once for all of them
+        _schedule_chatbot_reload('index')
+
+def _schedule_chatbot_reload(kind):
+    """
+    Queue a background reload of the chatbot's in-memory faqs, locations or visuals,
+    or ('index') a refit of its rule index.
+    """
+    with _chatbot_reload_lock:
+        if kind in _chatbot_reload_pending:
+            return
+        _chatbot_reload_pending.add(kind)
+    _chatbot_reload_executor.submit(_run_chatbot_reload, app, kind)
+
+def _mark_chatbot_data_changed(session, kind):
+    """
+    Flag kind ('faqs', 'locations' or 'visuals') to be refreshed once session commits.
+    """
+    session.info.setdefault('reload_kinds', set()).add(kind)
+
+@event.listens_for(OrmSession, 'after_commit')
+def _refresh_chatbot_data_on_commit(session):
+    # Runs once per committed transaction, however many rows of a kind changed
+    for kind in session.info.pop('reload_kinds', ()):
+        _invalidate_admin_listing(kind)
+        _schedule_chatbot_reload(kind)
+
+@event.listens_for(OrmSession, 'after_soft_rollback')
+def _discard_chatbot_data_marks(session, previous_transaction):
+    session.info.pop('reload_kinds', None)
+
 def retry_db_operation(operation, max_retries=3, delay=1):
     """
     Retry a database operation with exponential backoff.
+    Only connection-level errors are retried; anything else is raised immediately.
     """
-    import time
     for attempt in range(max_retries):
         try:
             return operation()
-        except Exception as e:
+        except DBAPIError as e:
+            retryable = isinstance(e, (OperationalError, InterfaceError)) or e.connection_invalidated
+            if not retryable:
+                raise
             if attempt < max_retries - 1:
                 app.logger.warning(f"Database operation failed (attempt {attempt + 1}): {str(e)}")
                 time.sleep(delay * (2 ** attempt))
@@ -357,13 +705,6 @@ def retry_db_operation(operation, max_retries=3, delay=1):
                 app.logger.error(f"Database operation failed after {max_retries} attempts: {str(e)}")
                 raise
 
-@app.route('/favicon.ico')
-def favicon():
-    """
-    Suppress favicon requests by returning 204 No Content.
-    """
-    return '', 204
-
 @app.route('/welcome')
 def welcome_api():
     """
@@ -395,9 +736,7 @@ def login():
             session['user_type'] = 'guest'
             session['logged_in'] = True
             # Log guest login
-            login_log = LoginLog(user_type='guest', identifier=username)
-            db.session.add(login_log)
-            db.session.commit()
+            _login_log_executor.submit(_write_login_log, app, 'guest', username)
             flash('Guest login successful!', 'success')
             return redirect(url_for('chat'))
         else:
@@ -408,23 +747,21 @@ def login():
                 flash('Please enter both username/email and password', 'danger')
                 return render_template('login.html', user_type=user_type)
 
-            user = UserModel.query.filter(
-                (UserModel.username == username_or_email) |
-                (UserModel.email == username_or_email)
-            ).first()
+            # Two single-column lookups so each one can use its unique index
+            params = {'v': username_or_email}
+            user = (db.session.execute(_LOGIN_BY_USERNAME, params).scalar_one_or_none()
+                    or db.session.execute(_LOGIN_BY_EMAIL, params).scalar_one_or_none())
 
             if user and user.check_password(password.strip()):
                 if not user.is_confirmed:
                     flash('Your account is pending admin confirmation. Please wait for approval.', 'warning')
                     return redirect(url_for('login', user_type='user'))
-                login_user(user, remember=True)
+                login_user(user, remember=request.form.get('remember') == 'on')
                 session['user_id'] = user.id
                 session['user_type'] = 'user'
                 session['logged_in'] = True
                 # Log user login
-                login_log = LoginLog(user_type='user', identifier=user.email)
-                db.session.add(login_log)
-                db.session.commit()
+                _login_log_executor.submit(_write_login_log, app, 'user', user.email)
                 flash('Login successful!', 'success')
                 return redirect(url_for('chat'))
 
@@ -436,7 +773,6 @@ def admin_login():
     """
     Handle admin login.
     """
-    from models import Admin as AdminModel
     if request.method == 'POST':
         email = request.form.get('email')
         password = request.form.get('password')
@@ -447,12 +783,12 @@ def admin_login():
 
         try:
             def get_admin():
-                return AdminModel.query.filter_by(email=email).first()
+                return db.session.execute(_ADMIN_BY_EMAIL, {'v': email}).scalar_one_or_none()
 
             admin = retry_db_operation(get_admin)
 
             if admin and admin.check_password(password.strip()):
-                login_user(admin, remember=True)
+                login_user(admin, remember=request.form.get('remember') == 'on')
                 session['user_id'] = admin.id
                 session['user_type'] = 'admin'
                 session['logged_in'] = True
@@ -476,7 +812,7 @@ def signup():
         password = request.form.get('password')
         confirm_password = request.form.get('confirm_password')
 
-        if not email or not re.match(r'^[^@]+@wvsu\.edu\.ph$', email):
+        if not email or not _WVSU_EMAIL_RE.match(email):
             flash('Email must be a wvsu.edu.ph email address', 'danger')
             return render_template('signup.html')
 
@@ -499,6 +835,7 @@ def signup():
         # Set is_confirmed to False explicitly (in case create_user does not set it)
         user.is_confirmed = False
         user_manager.db.session.commit()
+        _invalidate_dashboard_counts()
 
         flash('Account created! Please wait for admin confirmation before logging in.', 'info')
         return redirect(url_for('login', user_type='user'))
@@ -522,8 +859,6 @@ def chat():
     """
     Render the chat page with user info and chat history.
     """
-    from database import email_directory
-
     username = None
     role = session.get('user_type', 'guest')
 
@@ -537,13 +872,10 @@ def chat():
         elif role == 'user':
             username = current_user.username
         else:
-            # Handle other user types safely
-            if hasattr(current_user, 'username'):
-                username = current_user.username
-            elif hasattr(current_user, 'email'):
-                username = current_user.email
-            else:
-                username = str(current_user.id)  # Fallback to user ID
+            # Handle other user types safely, falling back to the user ID
+            username = (getattr(current_user, 'username', None)
+                        or getattr(current_user, 'email', None)
+                        or str(current_user.id))
     elif 'guest_username' in session:
         username = session['guest_username']
     else:
@@ -557,18 +889,16 @@ def chat():
         chat_sessions_summary = user_manager.get_chat_sessions_summary(current_user.id)
         if session_date:
             try:
-                selected_date = datetime.strptime(session_date, "%Y-%m-%d").date()
+                selected_date = datetime.fromisoformat(session_date).date()
             except ValueError:
                 selected_date = None
 
             if selected_date:
-                full_history = user_manager.get_chat_history(current_user.id)
-                if selected_date in full_history:
-                    chat_history = full_history[selected_date]
+                chat_history = user_manager.get_chat_history_for_date(current_user.id, selected_date) or None
         else:
             chat_history = None
 
-    emails = email_directory.get_all_emails()
+    emails = email_directory.get_all_emails_cached()
 
     return render_template(
         'chat.html', username=username, role=role,
@@ -576,52 +906,76 @@ def chat():
         emails=emails
     )
 
+def _save_chat_exchange(session_id, user_message, bot_response):
+    """
+    Persist a user message and the bot's reply for the current user or guest.
+    """
+    if current_user.is_authenticated and isinstance(current_user, UserModel) and session_id:
+        user_manager.add_chat_message(current_user.id, session_id, 'user', user_message)
+        user_manager.add_chat_message(current_user.id, session_id, 'bot', bot_response)
+    elif 'guest_username' in session and session_id:
+        # Store guest messages directly in database as one batched INSERT
+        guest_username = session['guest_username']
+        db.session.execute(insert(ChatMessage), [
+            {
+                'user_id': None,
+                'guest_username': guest_username,
+                'session_id': session_id,
+                'sender_type': 'user',
+                'message': user_message
+            },
+            {
+                'user_id': None,
+                'guest_username': guest_username,
+                'session_id': session_id,
+                'sender_type': 'bot',
+                'message': bot_response
+            }
+        ])
+        db.session.commit()
+
 @app.route('/send_message', methods=['POST'])
 def send_message():
     """
     Handle sending a message from the user and return chatbot response.
+    Send {"stream": true} to receive the response as NDJSON chunks instead of one JSON object.
     """
     try:
         data = request.get_json()
         user_message = data.get('message', '')
         session_id = data.get('session_id', '')
         user_role = session.get('user_type', None)
-        bot_response = chatbot.get_response(user_message, user_role=user_role)
 
-        if current_user.is_authenticated and isinstance(current_user, UserModel) and session_id:
-            user_manager.add_chat_message(current_user.id, session_id, 'user', user_message)
-            user_manager.add_chat_message(current_user.id, session_id, 'bot', bot_response)
-        elif 'guest_username' in session and session_id:
-            # Store guest messages directly in database
-            from models import ChatMessage
-            guest_username = session['guest_username']
-            guest_user_message = ChatMessage(
-                user_id=None,
-                guest_username=guest_username,
-                session_id=session_id,
-                sender_type='user',
-                message=user_message
-            )
-            guest_bot_message = ChatMessage(
-                user_id=None,
-                guest_username=guest_username,
-                session_id=session_id,
-                sender_type='bot',
-                message=bot_response
-            )
-            db.session.add(guest_user_message)
-            db.session.add(guest_bot_message)
-            db.session.commit()
+        if data.get('stream'):
+            def generate():
+                chunks = []
+                try:
+                    for chunk in chatbot.get_response_stream(user_message, user_role=user_role):
+                        chunks.append(chunk)
+                        yield json.dumps({'chunk': chunk}) + '\n'
+                    yield json.dumps({'done': True, 'timestamp': datetime.now().isoformat(sep=' ', timespec='seconds')}) + '\n'
+                finally:
+                    # Persist once the response has been sent
+                    if chunks:
+                        try:
+                            _save_chat_exchange(session_id, user_message, ''.join(chunks))
+                        except Exception as e:
+                            db.session.rollback()
+                            app.logger.error(f"Error saving streamed chat messages: {e}")
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+        bot_response = chatbot.get_response(user_message, user_role=user_role)
+        _save_chat_exchange(session_id, user_message, bot_response)
 
         return jsonify({
             'response': bot_response,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'timestamp': datetime.now().isoformat(sep=' ', timespec='seconds')
         })
     except Exception as e:
         app.logger.error(f"Error in send_message: {e}")
         return jsonify({
             'response': "I'm sorry, I encountered an error. Please try again.",
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            'timestamp': datetime.now().isoformat(sep=' ', timespec='seconds')
         }), 500
 
 @app.route('/clear_history', methods=['POST'])
@@ -673,62 +1027,34 @@ def delete_chat_session(session_id):
         return jsonify({'status': 'error', 'message': 'Session not found or could not be deleted'}), 404
 
 @app.route('/admin')
-@login_required
+@admin_page_required
 def admin_dashboard():
     """
     Render the admin dashboard landing page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     # Get pending counts for badges
-    pending_accounts = len(user_manager.get_pending_users())
-    from models import Feedback
-    pending_feedbacks = Feedback.query.count()
+    pending_accounts, pending_feedbacks = _get_dashboard_counts()
 
     return render_template('admin_dashboard.html', pending_accounts=pending_accounts, pending_feedbacks=pending_feedbacks)
 
 @app.route('/admin/rules')
-@login_required
+@admin_page_required
 def admin_rules():
     """
     Render the admin rules page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     rules = chatbot.rules
     guest_rules = chatbot.guest_rules
 
-    # Add category to each rule if missing (default to 'soict' for user rules)
-    def add_category(rules_list, default_category='soict'):
-        new_list = []
+    # Group rules by category in one pass, adding the default category to rules missing one
+    def bucket_by_category(rules_list, default_category):
+        buckets = defaultdict(list)
         for rule in rules_list:
-            if 'category' not in rule:
-                rule['category'] = default_category
-            new_list.append(rule)
-        return new_list
-
-    rules = add_category(rules, default_category='soict')
-    guest_rules = add_category(guest_rules, default_category='guest')
-
-    # Group rules by category for categorized display
-    categorized_user_rules = {}
-    categorized_guest_rules = {}
-
-    for rule in rules:
-        category = rule.get('category', 'soict')
-        if category not in categorized_user_rules:
-            categorized_user_rules[category] = []
-        categorized_user_rules[category].append(rule)
-
-    for rule in guest_rules:
-        category = rule.get('category', 'guest')
-        if category not in categorized_guest_rules:
-            categorized_guest_rules[category] = []
-        categorized_guest_rules[category].append(rule)
+            buckets[rule.setdefault('category', default_category)].append(rule)
+        return dict(buckets)
+
+    categorized_user_rules = bucket_by_category(rules, 'soict')
+    categorized_guest_rules = bucket_by_category(guest_rules, 'guest')
 
     return render_template('admin_rules.html',
                          rules=rules,
@@ -737,68 +1063,168 @@ def admin_rules():
                          categorized_guest_rules=categorized_guest_rules)
 
 @app.route('/admin/accounts')
-@login_required
+@admin_page_required
 def admin_accounts():
     """
     Render the admin accounts page for managing user confirmations.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     pending_users = user_manager.get_pending_users()
     return render_template('admin_accounts.html', pending_users=pending_users)
 
 @app.route('/admin/accounts/approve/<int:user_id>', methods=['POST'])
-@login_required
+@admin_required
 def approve_user(user_id):
     """
     Approve a user's account.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     success = user_manager.confirm_user(user_id)
     if success:
+        _invalidate_dashboard_counts()
         return jsonify({'status': 'success', 'message': 'User approved successfully'})
     else:
         return jsonify({'status': 'error', 'message': 'User not found'})
 
 @app.route('/admin/accounts/reject/<int:user_id>', methods=['POST'])
-@login_required
+@admin_required
 def reject_user(user_id):
     """
     Reject a user's account (delete the user).
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     success = user_manager.reject_user(user_id)
     if success:
+        _invalidate_dashboard_counts()
         return jsonify({'status': 'success', 'message': 'User rejected successfully'})
     else:
         return jsonify({'status': 'error', 'message': 'User not found'})
 
+# Expected JSON body fields per admin endpoint, as (name, default) pairs
+_CREATE_CATEGORY_FIELDS = (('category', ''),)
+_FEEDBACK_FIELDS = (('message', ''),)
+_MARK_FEEDBACK_FIELDS = (('feedback_id', None),)
+_ADD_RULE_FIELDS = (('keywords', ''), ('response', ''), ('user_type', 'user'), ('category', 'soict'))
+_DELETE_RULE_FIELDS = (('rule_id', None), ('user_type', 'user'))
+_EDIT_RULE_FIELDS = (('rule_id', None), ('question', ''), ('response', ''), ('user_type', 'user'))
+_ADD_EMAIL_FIELDS = (('school', ''), ('email', ''))
+_UPDATE_EMAIL_FIELDS = (('id', None), ('school', ''), ('email', ''))
+_DELETE_EMAIL_FIELDS = (('id', None),)
+
+def _json_fields(fields):
+    """
+    Parse the JSON body once and return the requested fields as a tuple, in order.
+    String values are stripped; a missing or non-object body yields the defaults.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    values = []
+    for name, default in fields:
+        value = data.get(name, default)
+        values.append(value.strip() if isinstance(value, str) else value)
+    return tuple(values)
+
+def _admin_page_window():
+    """
+    Return (limit, offset) for the ?page=&per_page= query parameters, or
+    (None, None) to list every row when no page is requested.
+    """
+    page = request.args.get('page', type=int)
+    if not page or page < 1:
+        return None, None
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 500)
+    return per_page, (page - 1) * per_page
+
+def _admin_pager():
+    """
+    Return (page, per_page) for the ?page=&per_page= query parameters, defaulting
+    to the first 50 rows; per_page is capped at 500.
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 500)
+    return page, per_page
+
+def _flatten_questions(qs):
+    """
+    Flatten a list of question sets (list of lists) into a flat list.
+    """
+    if not qs:
+        return []
+    if isinstance(qs, list) and isinstance(qs[0], list):
+        return list(chain.from_iterable(q if isinstance(q, list) else (str(q),) for q in qs))
+    return qs
+
+def _media_listing_row(row):
+    """
+    Convert a location/visual listing row to the dict the admin templates expect.
+    """
+    # The text columns already come back as str; isoformat() matches the
+    # old '%Y-%m-%d %H:%M:%S' output without parsing a format string per row
+    return {
+        'id': row.id,
+        'description': row.description or '',
+        'user_type': row.user_type or 'both',
+        'urls': row.urls if isinstance(row.urls, list) else [],
+        'url': row.url or '',
+        'questions': _flatten_questions(row.questions),
+        'created_at': row.created_at.isoformat(sep=' ', timespec='seconds') if row.created_at else ''
+    }
+
+def _load_admin_listing(kind, limit, offset):
+    """
+    Fetch one admin listing page ('faqs', 'locations' or 'visuals') from the chatbot database.
+    """
+    # Use direct session with chatbot_engine to ensure correct database connection
+    with ChatbotSession() as session:
+        if kind == 'faqs':
+            # Project only the columns the template needs (no ORM instances)
+            rows = session.execute(
+                select(Faq.id, Faq.question, Faq.answer)
+                .order_by(Faq.created_at.desc())
+                .limit(limit).offset(offset)
+            )
+            return [{"id": r.id, "question": r.question, "answer": r.answer} for r in rows]
+
+        model = Location if kind == 'locations' else Visual
+        rows = session.execute(
+            select(model.id, model.description, model.user_type, model.urls,
+                   model.url, model.questions, model.created_at)
+            .order_by(model.created_at.desc())
+            .limit(limit).offset(offset)
+        )
+        return [_media_listing_row(row) for row in rows]
+
+# Admin listing pages per kind, keyed by (version, limit, offset). The add/edit/
+# delete routes bump the version, so a load that raced an edit is never served.
+_admin_listing_versions = {'faqs': 0, 'locations': 0, 'visuals': 0}
+_admin_listing_cache = {'faqs': {}, 'locations': {}, 'visuals': {}}
+
+def _get_admin_listing(kind, ttl=300.0):
+    """
+    Return the requested admin listing page, hitting the database only on a cache miss.
+    """
+    limit, offset = _admin_page_window()
+    key = (_admin_listing_versions[kind], limit, offset)
+    now = time.monotonic()
+    entry = _admin_listing_cache[kind].get(key)
+    if entry is None or now - entry['ts'] > ttl:
+        entry = {'ts': now, 'val': _load_admin_listing(kind, limit, offset)}
+        _admin_listing_cache[kind][key] = entry
+    return entry['val']
+
+def _invalidate_admin_listing(kind):
+    """
+    Drop the cached admin listing pages for kind after an add, edit or delete.
+    """
+    _admin_listing_versions[kind] += 1
+    _admin_listing_cache[kind] = {}
+
 @app.route('/admin/faqs')
-@login_required
+@admin_page_required
 def admin_faqs():
     """
     Render the admin FAQs management page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
-    from chatbot_models import Faq
-    from sqlalchemy.orm import sessionmaker
     try:
-        # Use direct session with chatbot_engine to ensure correct database connection
-        Session = sessionmaker(bind=chatbot_engine)
-        session = Session()
-        faqs_list = session.query(Faq).order_by(Faq.created_at.desc()).all()
-        session.close()
-        # Convert to list format expected by template
-        faqs_data = [{"id": faq.id, "question": faq.question, "answer": faq.answer} for faq in faqs_list]
+        faqs_data = _get_admin_listing('faqs')
     except Exception as e:
         faqs_data = []
         app.logger.error(f"Failed to load FAQs from MySQL: {e}")
@@ -811,14 +1237,11 @@ def admin_faqs():
     return response
 
 @app.route('/add_info', methods=['POST'])
-@login_required
+@admin_required
 def add_info():
     """
     Add a new FAQ entry to MySQL Faq table.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     question = data.get('question', '').strip()
     answer = data.get('answer', '').strip()
@@ -826,32 +1249,52 @@ def add_info():
     if not question or not answer:
         return jsonify({'status': 'error', 'message': 'Question and answer are required'})
 
-    from chatbot_models import Faq
-    from sqlalchemy.orm import sessionmaker
     try:
         # Use direct session with chatbot_engine to ensure correct database connection
-        Session = sessionmaker(bind=chatbot_engine)
-        session = Session()
-        new_faq = Faq(question=question, answer=answer)
-        session.add(new_faq)
-        session.commit()
-        session.close()
-        # Reload FAQs in chatbot memory
-        chatbot.reload_faqs()
+        with ChatbotSession() as session:
+            new_faq = Faq(question=question, answer=answer)
+            session.add(new_faq)
+            _mark_chatbot_data_changed(session, 'faqs')
+            session.commit()
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'Failed to save FAQ: {str(e)}'})
 
     return jsonify({'status': 'success'})
 
+@app.route('/bulk_add_info', methods=['POST'])
+@admin_required
+def bulk_add_info():
+    """
+    Add a JSON array of {question, answer} FAQ entries with one multi-row INSERT.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return jsonify({'status': 'error', 'message': 'A non-empty JSON array of FAQs is required'})
+
+    rows = []
+    for i, item in enumerate(items):
+        question = str(item.get('question') or '').strip() if isinstance(item, dict) else ''
+        answer = str(item.get('answer') or '').strip() if isinstance(item, dict) else ''
+        if not question or not answer:
+            return jsonify({'status': 'error', 'message': f'Item {i}: question and answer are required'})
+        rows.append({'question': question, 'answer': answer})
+
+    try:
+        db.session.execute(insert(Faq), rows)
+        _mark_chatbot_data_changed(db.session, 'faqs')
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Failed to save FAQs: {str(e)}'})
+
+    return jsonify({'status': 'success', 'count': len(rows)})
+
 @app.route('/edit_info', methods=['POST'])
-@login_required
+@admin_required
 def edit_info():
     """
     Edit an existing FAQ entry in MySQL Faq table.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     info_id = data.get('info_id')
     question = data.get('question', '').strip()
@@ -862,53 +1305,43 @@ def edit_info():
     if info_id is None or not question or not answer:
         return jsonify({'status': 'error', 'message': 'ID, question, and answer are required'})
 
-    from chatbot_models import Faq
-    from sqlalchemy.orm import sessionmaker
     try:
         # Use direct session with chatbot_engine to ensure correct database connection
-        Session = sessionmaker(bind=chatbot_engine)
-        session = Session()
-        faq = session.query(Faq).get(info_id)
-        if not faq:
-            session.close()
-            return jsonify({'status': 'error', 'message': 'FAQ not found'})
-
-        faq.question = question
-        faq.answer = answer
-        session.commit()
-        session.close()
-        # Reload FAQs in chatbot memory
-        chatbot.reload_faqs()
+        with ChatbotSession() as session:
+            faq = session.get(Faq, info_id)
+            if not faq:
+                return jsonify({'status': 'error', 'message': 'FAQ not found'})
+
+            faq.question = question
+            faq.answer = answer
+            _mark_chatbot_data_changed(session, 'faqs')
+            session.commit()
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'Failed to update FAQ: {str(e)}'})
 
     return jsonify({'status': 'success'})
 
 @app.route('/delete_info', methods=['POST'])
-@login_required
+@admin_required
 def delete_info():
     """
     Delete an FAQ entry from MySQL Faq table.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     info_id = data.get('info_id')
 
     if info_id is None:
         return jsonify({'status': 'error', 'message': 'ID is required'})
 
-    from chatbot_models import Faq
     try:
-        faq = Faq.query.get(info_id)
-        if not faq:
+        # Single DELETE round trip; rowcount tells us whether the FAQ existed
+        result = db.session.execute(_DELETE_FAQ, {'id': info_id})
+        if result.rowcount == 0:
+            db.session.rollback()
             return jsonify({'status': 'error', 'message': 'FAQ not found'})
 
-        db.session.delete(faq)
+        _mark_chatbot_data_changed(db.session, 'faqs')
         db.session.commit()
-        # Reload FAQs in chatbot memory
-        chatbot.reload_faqs()
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to delete FAQ: {str(e)}'})
@@ -916,73 +1349,29 @@ def delete_info():
     return jsonify({'status': 'success'})
 
 @app.route('/admin/locations')
-@login_required
+@admin_page_required
 def admin_locations():
     """
     Render the admin locations page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     return render_template('admin_locations.html')
 
 @app.route('/admin/add_locations')
-@login_required
+@admin_page_required
 def admin_add_locations():
     """
     Render the admin add locations page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     return render_template('admin_add_locations.html')
 
 @app.route('/admin/existing_locations')
-@login_required
+@admin_page_required
 def admin_existing_locations():
     """
     Render the admin existing locations page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     try:
-        # Use direct database query to ensure correct data retrieval
-        from chatbot_models import Location
-        from sqlalchemy.orm import sessionmaker
-
-        Session = sessionmaker(bind=chatbot_engine)
-        session = Session()
-        locations_list = session.query(Location).order_by(Location.created_at.desc()).all()
-        session.close()
-
-        # Convert to list format expected by template
-        locations = []
-        for loc in locations_list:
-            # Flatten questions if it's a list of lists
-            questions = loc.questions if loc.questions else []
-            if isinstance(questions, list) and len(questions) > 0 and isinstance(questions[0], list):
-                flattened_questions = []
-                for q_list in questions:
-                    if isinstance(q_list, list):
-                        flattened_questions.extend(q_list)
-                    else:
-                        flattened_questions.append(str(q_list))
-                questions = flattened_questions
-
-            location_dict = {
-                'id': str(loc.id),
-                'description': str(loc.description or ''),
-                'user_type': str(loc.user_type or 'both'),
-                'urls': loc.urls if isinstance(loc.urls, list) else [],
-                'url': str(loc.url or ''),
-                'questions': questions,
-                'created_at': loc.created_at.strftime('%Y-%m-%d %H:%M:%S') if loc.created_at else ''
-            }
-            locations.append(location_dict)
+        locations = _get_admin_listing('locations')
     except Exception as e:
         locations = []
         app.logger.error(f"Failed to load locations from database: {e}")
@@ -990,92 +1379,244 @@ def admin_existing_locations():
     return render_template('admin_existing_locations.html', locations=locations)
 
 @app.route('/admin/visuals')
-@login_required
+@admin_page_required
 def admin_visuals():
     """
     Render the admin visuals page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     return render_template('admin_visuals.html')
 
 @app.route('/admin/add_visuals')
-@login_required
+@admin_page_required
 def admin_add_visuals():
     """
     Render the admin add visuals page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     return render_template('admin_add_visuals.html')
 
 @app.route('/admin/existing_visuals')
-@login_required
+@admin_page_required
 def admin_existing_visuals():
     """
     Render the admin existing visuals page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     try:
-        # Use direct database query to ensure correct data retrieval
-        from chatbot_models import Visual
-        from sqlalchemy.orm import sessionmaker
-
-        Session = sessionmaker(bind=chatbot_engine)
-        session = Session()
-        visuals_list = session.query(Visual).order_by(Visual.created_at.desc()).all()
-        session.close()
-
-        # Convert to list format expected by template
-        visuals = []
-        for vis in visuals_list:
-            # Flatten questions if it's a list of lists
-            questions = vis.questions if vis.questions else []
-            if isinstance(questions, list) and len(questions) > 0 and isinstance(questions[0], list):
-                flattened_questions = []
-                for q_list in questions:
-                    if isinstance(q_list, list):
-                        flattened_questions.extend(q_list)
-                    else:
-                        flattened_questions.append(str(q_list))
-                questions = flattened_questions
-
-            visual_dict = {
-                'id': str(vis.id),
-                'description': str(vis.description or ''),
-                'user_type': str(vis.user_type or 'both'),
-                'urls': vis.urls if isinstance(vis.urls, list) else [],
-                'url': str(vis.url or ''),
-                'questions': questions,
-                'created_at': vis.created_at.strftime('%Y-%m-%d %H:%M:%S') if vis.created_at else ''
-            }
-            visuals.append(visual_dict)
+        visuals = _get_admin_listing('visuals')
     except Exception as e:
         visuals = []
         app.logger.error(f"Failed to load visuals from database: {e}")
 
     return render_template('admin_existing_visuals.html', visuals=visuals)
 
+def _parse_json_field(name, default):
+    """
+    Parse a JSON-encoded form field, returning default when it is missing or blank.
+    """
+    raw = request.form.get(name, '').strip()
+    return json.loads(raw) if raw else default
+
+def _normalize_questions(questions_data):
+    """
+    Normalize submitted question sets into a list of lists of stripped, non-empty strings.
+    """
+    questions_list = []
+    for item in questions_data:
+        t = type(item)
+        if t is str:
+            item = item.strip()
+            questions_list.append([item] if item else [])
+        elif t is list:
+            questions_list.append([k.strip() for k in item if isinstance(k, str) and k.strip()])
+        else:
+            questions_list.append([])
+    return questions_list
+
+# Upload folder config key and public URL prefix for each media kind
+_MEDIA_KINDS = {
+    'locations': ('UPLOAD_FOLDER', 'uploads/locations/'),
+    'visuals': ('VISUALS_UPLOAD_FOLDER', 'uploads/visuals/'),
+}
+
+def _create_media_entry(kind, files, filenames, *fields):
+    """
+    Save the uploads for a new location or visual, insert its row and refresh the caches.
+    """
+    folder = app.config[_MEDIA_KINDS[kind][0]]
+    _insert_media_row(kind, _save_uploads(files, folder, filenames), *fields)
+
+def _insert_media_row(kind, stored_names, questions_list, description, user_type):
+    """
+    Insert the row for a new location or visual whose files are already stored.
+    """
+    model = Location if kind == 'locations' else Visual
+    url_prefix = _MEDIA_KINDS[kind][1]
+    urls = [url_prefix + name for name in stored_names]
+    try:
+        db.session.add(model(
+            id=str(uuid.uuid4()),
+            questions=questions_list,
+            description=description,
+            user_type=user_type,
+            urls=urls,
+            url=urls[0]  # Primary image
+        ))
+        _mark_chatbot_data_changed(db.session, kind)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+# Background add_location/add_visual jobs, polled through /upload_status/<job_id>.
+# Request threads and job workers share _upload_jobs, so every access holds the lock.
+_upload_job_executor = ThreadPoolExecutor(max_workers=2)
+_upload_jobs = {}
+_upload_jobs_lock = threading.Lock()
+_UPLOAD_JOB_TTL = 3600.0
+
+def _set_upload_job(job_id, status, message=''):
+    """
+    Record a job's outcome; a job already purged by the TTL sweep is left alone.
+    """
+    with _upload_jobs_lock:
+        job = _upload_jobs.get(job_id)
+        if job is not None:
+            job.update(status=status, message=message)
+
+def _run_upload_job(flask_app, job_id, kind, spooled, fields):
+    """
+    Move spooled uploads into place and insert the new row in its own app context
+    (runs on the job executor).
+    """
+    folder = flask_app.config[_MEDIA_KINDS[kind][0]]
+    with flask_app.app_context():
+        try:
+            stored_names = [_store_spooled(path, folder, name) for path, name in spooled]
+            _insert_media_row(kind, stored_names, *fields)
+            _set_upload_job(job_id, 'success')
+        except Exception as e:
+            flask_app.logger.error(f"Upload job {job_id} failed: {str(e)}")
+            _set_upload_job(job_id, 'error', str(e))
+        finally:
+            for path, _ in spooled:
+                if os.path.exists(path):
+                    os.unlink(path)
+
+def _start_upload_job(kind, files, filenames, *fields):
+    """
+    Spool the request's uploads to disk and finish the add in the background; returns the job id.
+    """
+    now = time.monotonic()
+    with _upload_jobs_lock:
+        for stale_id in [j for j, job in _upload_jobs.items() if now - job['ts'] > _UPLOAD_JOB_TTL]:
+            del _upload_jobs[stale_id]
+
+    folder = app.config[_MEDIA_KINDS[kind][0]]
+    spooled = []
+    try:
+        # The request's upload streams are closed once the response is sent, so the
+        # files are written (and hashed) here; the job only renames them into place
+        for file, filename in zip(files, filenames or repeat(None)):
+            spooled.append(_spool_upload(file, folder, filename))
+    except Exception:
+        for path, _ in spooled:
+            os.unlink(path)
+        raise
+
+    job_id = uuid.uuid4().hex
+    with _upload_jobs_lock:
+        _upload_jobs[job_id] = {'status': 'pending', 'message': '', 'ts': now}
+    _upload_job_executor.submit(_run_upload_job, app, job_id, kind, spooled, fields)
+    return job_id
+
+def _wants_async_upload():
+    """
+    Whether the client asked for add_location/add_visual to finish in the background.
+    """
+    return request.form.get('async', '').lower() in ('1', 'true')
+
+@app.route('/upload_status/<job_id>')
+@admin_required
+def upload_status(job_id):
+    """
+    Report the state of a background location/visual upload job.
+    """
+    with _upload_jobs_lock:
+        job = _upload_jobs.get(job_id)
+        if job is not None:
+            job = dict(job)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Upload job not found'})
+    return jsonify({'status': job['status'], 'message': job['message']})
+
+def _bulk_add_media(kind):
+    """
+    Insert a JSON array of locations or visuals whose media was uploaded beforehand.
+    Each item carries questions, description, user_type and a list of urls.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return jsonify({'status': 'error', 'message': f'A non-empty JSON array of {kind} is required'})
+
+    model = Location if kind == 'locations' else Visual
+    rows = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({'status': 'error', 'message': f'Item {i}: expected an object'})
+        description = str(item.get('description') or '').strip()
+        questions = item.get('questions') or []
+        if isinstance(questions, str):
+            questions = [questions]
+        if not isinstance(questions, list):
+            return jsonify({'status': 'error', 'message': f'Item {i}: questions must be a list'})
+        urls = item.get('urls') or []
+        if not isinstance(urls, list):
+            return jsonify({'status': 'error', 'message': f'Item {i}: urls must be a list'})
+        urls = [url for url in urls if isinstance(url, str) and url]
+        if not description or not urls:
+            return jsonify({'status': 'error', 'message': f'Item {i}: description and at least one URL are required'})
+        if kind == 'locations' and not questions:
+            return jsonify({'status': 'error', 'message': f'Item {i}: questions are required'})
+        rows.append({
+            'id': str(uuid.uuid4()),
+            'questions': _normalize_questions(questions),
+            'description': description,
+            'user_type': item.get('user_type') or 'both',
+            'urls': urls,
+            'url': urls[0]  # Primary image
+        })
+
+    try:
+        db.session.execute(insert(model), rows)
+        _mark_chatbot_data_changed(db.session, kind)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Failed to save {kind}: {str(e)}'})
+
+    return jsonify({'status': 'success', 'count': len(rows)})
+
+@app.route('/bulk_add_location', methods=['POST'])
+@admin_required
+def bulk_add_location():
+    """
+    Add a JSON array of locations (with already-uploaded image URLs) in one INSERT.
+    """
+    return _bulk_add_media('locations')
+
+@app.route('/bulk_add_visual', methods=['POST'])
+@admin_required
+def bulk_add_visual():
+    """
+    Add a JSON array of visuals (with already-uploaded media URLs) in one INSERT.
+    """
+    return _bulk_add_media('visuals')
+
 @app.route('/add_location', methods=['POST'])
-@login_required
+@admin_required
 def add_location():
     """
     Add a new location with images to MySQL Location table.
     """
-    import json
-    import os
-    import uuid
-
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     questions = request.form.get('questions', '').strip()
     description = request.form.get('description', '').strip()
     user_type = request.form.get('user_type', 'both')
@@ -1084,90 +1625,65 @@ def add_location():
         return jsonify({'status': 'error', 'message': 'Questions and description are required'})
 
     # Process questions as JSON array of strings, each string is a separate set
-    questions_data = json.loads(questions) if questions else []
-    questions_list = []
-    for set_str in questions_data:
-        if isinstance(set_str, str):
-            set_list = [set_str.strip()] if set_str.strip() else []
-        elif isinstance(set_str, list):
-            set_list = [k.strip() for k in set_str if k.strip()]
-        else:
-            set_list = []
-        questions_list.append(set_list)
+    questions_list = _normalize_questions(_parse_json_field('questions', []))
 
     # Handle file uploads
-    uploaded_files = request.files.getlist('images')
-    image_urls = []
-
-    for file in uploaded_files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            file.save(filepath)
-            image_urls.append(f"uploads/locations/{unique_filename}")
-
-    if not image_urls:
+    uploaded_files = [f for f in request.files.getlist('images') if f and allowed_file(f.filename)]
+    if not uploaded_files:
         return jsonify({'status': 'error', 'message': 'At least one image is required'})
 
-    # Save to MySQL Location table
-    from chatbot_models import Location
+    fields = (questions_list, description, user_type)
+    if _wants_async_upload():
+        job_id = _start_upload_job('locations', uploaded_files, None, *fields)
+        return jsonify({'status': 'pending', 'job_id': job_id})
+
+    # Save images and the MySQL Location row
     try:
-        new_location = Location(
-            id=str(uuid.uuid4()),
-            questions=questions_list,
-            description=description,
-            user_type=user_type,
-            urls=image_urls,
-            url=image_urls[0]  # Primary image
-        )
-        db.session.add(new_location)
-        db.session.commit()
-        # Reload location rules in chatbot memory
-        chatbot.reload_location_rules()
+        _create_media_entry('locations', uploaded_files, None, *fields)
     except Exception as e:
-        db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to save location: {str(e)}'})
 
     return jsonify({'status': 'success'})
 
 @app.route('/edit_location/<location_id>', methods=['POST'])
-@login_required
+@admin_required
 def edit_location_with_id(location_id):
     """
     Edit an existing location with images in MySQL Location table.
     """
-    import json
-    import os
-    import uuid
-
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     questions = request.form.get('questions', '').strip()
     description = request.form.get('description', '').strip()
     user_type = request.form.get('user_type', 'both')
-    removed_images = json.loads(request.form.get('removedImages', '[]'))
+    removed_images = _parse_json_field('removedImages', [])
 
     if not questions or not description:
         return jsonify({'status': 'error', 'message': 'Questions and description are required'})
 
     # Process questions as JSON array of strings, each string is a separate set
-    questions_data = json.loads(questions) if questions else []
-    questions_list = []
-    for set_str in questions_data:
-        if isinstance(set_str, str):
-            set_list = [set_str.strip()] if set_str.strip() else []
-        elif isinstance(set_str, list):
-            set_list = [k.strip() for k in set_str if k.strip()]
-        else:
-            set_list = []
-        questions_list.append(set_list)
+    questions_list = _normalize_questions(_parse_json_field('questions', []))
+
+    uploaded_files = [f for f in request.files.getlist('images') if f and allowed_file(f.filename)]
+
+    if not removed_images and not uploaded_files:
+        # Only scalar fields change, so update in place without loading the row
+        try:
+            result = db.session.execute(
+                update(Location).where(Location.id == location_id)
+                .values(questions=questions_list, description=description, user_type=user_type)
+            )
+            if result.rowcount == 0:
+                db.session.rollback()
+                return jsonify({'status': 'error', 'message': 'Location not found'})
+            _mark_chatbot_data_changed(db.session, 'locations')
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'status': 'error', 'message': f'Failed to save location: {str(e)}'})
+
+        return jsonify({'status': 'success'})
 
     # Find location to edit in MySQL
-    from chatbot_models import Location
-    location_to_edit = Location.query.filter_by(id=location_id).first()
+    location_to_edit = db.session.get(Location, location_id)
     if not location_to_edit:
         return jsonify({'status': 'error', 'message': 'Location not found'})
 
@@ -1177,24 +1693,16 @@ def edit_location_with_id(location_id):
     location_to_edit.user_type = user_type
 
     # Handle image removal
+    removed_set = frozenset(url for url in removed_images if isinstance(url, str))
     if location_to_edit.urls:
-        location_to_edit.urls = [url for url in location_to_edit.urls if url not in removed_images]
+        location_to_edit.urls = [url for url in location_to_edit.urls if url not in removed_set]
 
-    if location_to_edit.url in removed_images:
+    if location_to_edit.url in removed_set:
         location_to_edit.url = None
 
     # Handle new image uploads
-    uploaded_files = request.files.getlist('images')
-    new_image_urls = []
-
-    for file in uploaded_files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            file.save(filepath)
-            new_image_urls.append(f"uploads/locations/{unique_filename}")
+    new_image_urls = [f"uploads/locations/{name}" for name in
+                      _save_uploads(uploaded_files, app.config['UPLOAD_FOLDER'])]
 
     # Add new images to existing ones
     if not location_to_edit.urls:
@@ -1208,9 +1716,8 @@ def edit_location_with_id(location_id):
 
     # Save to MySQL
     try:
+        _mark_chatbot_data_changed(db.session, 'locations')
         db.session.commit()
-        # Reload location rules in chatbot memory
-        chatbot.reload_location_rules()
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to save location: {str(e)}'})
@@ -1218,30 +1725,25 @@ def edit_location_with_id(location_id):
     return jsonify({'status': 'success'})
 
 @app.route('/delete_location', methods=['POST'])
-@login_required
+@admin_required
 def delete_location():
     """
     Delete a location entry from MySQL Location table.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     location_id = data.get('id')
 
     if not location_id:
         return jsonify({'status': 'error', 'message': 'ID is required'})
 
-    from chatbot_models import Location
     try:
-        location = Location.query.filter_by(id=location_id).first()
-        if not location:
+        result = db.session.execute(_DELETE_LOCATION, {'id': location_id})
+        if result.rowcount == 0:
+            db.session.rollback()
             return jsonify({'status': 'error', 'message': 'Location not found'})
 
-        db.session.delete(location)
+        _mark_chatbot_data_changed(db.session, 'locations')
         db.session.commit()
-        # Reload location rules in chatbot memory
-        chatbot.reload_location_rules()
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to delete location: {str(e)}'})
@@ -1249,20 +1751,13 @@ def delete_location():
     return jsonify({'status': 'success'})
 
 @app.route('/add_visual', methods=['POST'])
-@login_required
+@admin_required
 def add_visual():
     """
     Add a new visual with images/videos to MySQL Visual table.
     """
-    import json
-    import os
-    import uuid
-
     app.logger.info(f"Request received: {request.method} {request.path}")
 
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     questions = request.form.get('questions', '').strip()
     description = request.form.get('description', '').strip()
     user_type = request.form.get('user_type', 'both')
@@ -1271,91 +1766,67 @@ def add_visual():
         return jsonify({'status': 'error', 'message': 'Description is required'})
 
     # Process questions as JSON array of strings, each string is a separate set
-    questions_data = json.loads(questions) if questions else []
-    questions_list = []
-    for set_str in questions_data:
-        if isinstance(set_str, str):
-            set_list = [set_str.strip()] if set_str.strip() else []
-        elif isinstance(set_str, list):
-            set_list = [k.strip() for k in set_str if k.strip()]
-        else:
-            set_list = []
-        questions_list.append(set_list)
+    questions_list = _normalize_questions(_parse_json_field('questions', []))
 
     # Handle file uploads
-    uploaded_files = request.files.getlist('images')
-    media_urls = []
-
-    for file in uploaded_files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            filename = re.sub(r'\.+', '.', filename)  # Replace multiple dots with single dot
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            filepath = os.path.join(app.config['VISUALS_UPLOAD_FOLDER'], unique_filename)
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            file.save(filepath)
-            media_urls.append(f"uploads/visuals/{unique_filename}")
-
-    if not media_urls:
+    uploaded_files = [f for f in request.files.getlist('images') if f and allowed_file(f.filename)]
+    # Replace multiple dots with single dot
+    filenames = [_MULTI_DOT_RE.sub('.', secure_filename(f.filename)) for f in uploaded_files]
+    if not uploaded_files:
         return jsonify({'status': 'error', 'message': 'At least one image or video is required'})
 
-    # Save to MySQL Visual table
-    from chatbot_models import Visual
+    fields = (questions_list, description, user_type)
+    if _wants_async_upload():
+        job_id = _start_upload_job('visuals', uploaded_files, filenames, *fields)
+        return jsonify({'status': 'pending', 'job_id': job_id})
+
+    # Save media and the MySQL Visual row
     try:
-        new_visual = Visual(
-            id=str(uuid.uuid4()),
-            questions=questions_list,
-            description=description,
-            user_type=user_type,
-            urls=media_urls,
-            url=media_urls[0]  # Primary media
-        )
-        db.session.add(new_visual)
-        db.session.commit()
-        # Update visuals in memory
-        chatbot.reload_visual_rules()
+        _create_media_entry('visuals', uploaded_files, filenames, *fields)
     except Exception as e:
-        db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to save visual: {str(e)}'})
 
     return jsonify({'status': 'success'})
 
 @app.route('/edit_visual/<visual_id>', methods=['POST'])
-@login_required
+@admin_required
 def edit_visual_with_id(visual_id):
     """
     Edit an existing visual with images/videos in MySQL Visual table.
     """
-    import json
-    import os
-    import uuid
-
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     questions = request.form.get('questions', '').strip()
     description = request.form.get('description', '').strip()
     user_type = request.form.get('user_type', 'both')
-    removed_images = json.loads(request.form.get('removedImages', '[]'))
+    removed_images = _parse_json_field('removedImages', [])
 
     if not questions or not description:
         return jsonify({'status': 'error', 'message': 'Questions and description are required'})
 
     # Process questions as JSON array of strings, each string is a separate set
-    questions_data = json.loads(questions) if questions else []
-    questions_list = []
-    for set_str in questions_data:
-        if isinstance(set_str, str):
-            set_list = [set_str.strip()] if set_str.strip() else []
-        elif isinstance(set_str, list):
-            set_list = [k.strip() for k in set_str if k.strip()]
-        else:
-            set_list = []
-        questions_list.append(set_list)
+    questions_list = _normalize_questions(_parse_json_field('questions', []))
+
+    uploaded_files = [f for f in request.files.getlist('images') if f and allowed_file(f.filename)]
+
+    if not removed_images and not uploaded_files:
+        # Only scalar fields change, so update in place without loading the row
+        try:
+            result = db.session.execute(
+                update(Visual).where(Visual.id == visual_id)
+                .values(questions=questions_list, description=description, user_type=user_type)
+            )
+            if result.rowcount == 0:
+                db.session.rollback()
+                return jsonify({'status': 'error', 'message': 'Visual not found'})
+            _mark_chatbot_data_changed(db.session, 'visuals')
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'status': 'error', 'message': f'Failed to save visual: {str(e)}'})
+
+        return jsonify({'status': 'success'})
 
     # Find visual to edit in MySQL
-    from chatbot_models import Visual
-    visual_to_edit = Visual.query.filter_by(id=visual_id).first()
+    visual_to_edit = db.session.get(Visual, visual_id)
     if not visual_to_edit:
         return jsonify({'status': 'error', 'message': 'Visual not found'})
 
@@ -1365,24 +1836,16 @@ def edit_visual_with_id(visual_id):
     visual_to_edit.user_type = user_type
 
     # Handle image removal
+    removed_set = frozenset(url for url in removed_images if isinstance(url, str))
     if visual_to_edit.urls:
-        visual_to_edit.urls = [url for url in visual_to_edit.urls if url not in removed_images]
+        visual_to_edit.urls = [url for url in visual_to_edit.urls if url not in removed_set]
 
-    if visual_to_edit.url in removed_images:
+    if visual_to_edit.url in removed_set:
         visual_to_edit.url = None
 
     # Handle new media uploads
-    uploaded_files = request.files.getlist('images')
-    new_media_urls = []
-
-    for file in uploaded_files:
-        if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            filepath = os.path.join(app.config['VISUALS_UPLOAD_FOLDER'], unique_filename)
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            file.save(filepath)
-            new_media_urls.append(f"uploads/visuals/{unique_filename}")
+    new_media_urls = [f"uploads/visuals/{name}" for name in
+                      _save_uploads(uploaded_files, app.config['VISUALS_UPLOAD_FOLDER'])]
 
     # Add new media to existing ones
     if not visual_to_edit.urls:
@@ -1396,9 +1859,8 @@ def edit_visual_with_id(visual_id):
 
     # Save to MySQL
     try:
+        _mark_chatbot_data_changed(db.session, 'visuals')
         db.session.commit()
-        # Update visuals in memory
-        chatbot.reload_visual_rules()
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to save visual: {str(e)}'})
@@ -1406,30 +1868,25 @@ def edit_visual_with_id(visual_id):
     return jsonify({'status': 'success'})
 
 @app.route('/delete_visual', methods=['POST'])
-@login_required
+@admin_required
 def delete_visual():
     """
     Delete a visual entry from MySQL Visual table.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     visual_id = data.get('id')
 
     if not visual_id:
         return jsonify({'status': 'error', 'message': 'ID is required'})
 
-    from chatbot_models import Visual
     try:
-        visual = Visual.query.filter_by(id=visual_id).first()
-        if not visual:
+        result = db.session.execute(_DELETE_VISUAL, {'id': visual_id})
+        if result.rowcount == 0:
+            db.session.rollback()
             return jsonify({'status': 'error', 'message': 'Visual not found'})
 
-        db.session.delete(visual)
+        _mark_chatbot_data_changed(db.session, 'visuals')
         db.session.commit()
-        # Reload visual rules in chatbot memory
-        chatbot.reload_visual_rules()
     except Exception as e:
         db.session.rollback()
         return jsonify({'status': 'error', 'message': f'Failed to delete visual: {str(e)}'})
@@ -1437,76 +1894,77 @@ def delete_visual():
     return jsonify({'status': 'success'})
 
 @app.route('/admin/emails')
-@login_required
+@admin_page_required
 def admin_emails():
     """
     Render the admin emails page.
     """
-    from database import email_directory
+    emails = email_directory.get_all_emails_cached()
 
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
+    return render_template('admin_emails.html', emails=emails)
 
-    emails = email_directory.get_all_emails()
+# Parsed categories.json, keyed by the file's (mtime, size) so edits on disk are picked up
+_categories_cache = {'key': None, 'list': [], 'lower_set': frozenset()}
 
-    return render_template('admin_emails.html', emails=emails)
+def _load_categories(path):
+    """
+    Return the cached categories.json contents, re-reading the file only when it changes.
+    A missing file is treated as an empty category list.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {'key': None, 'list': [], 'lower_set': frozenset()}
+    key = (st.st_mtime_ns, st.st_size)
+    if key != _categories_cache['key']:
+        with open(path, 'rb') as f:
+            categories = json.loads(f.read())
+        _categories_cache.update(key=key, list=categories,
+                                 lower_set=frozenset(cat.lower() for cat in categories))
+    return _categories_cache
+
+def _save_categories(path, categories):
+    """
+    Atomically write categories.json and refresh the cache to match what was written.
+    """
+    rule_utils.write_json_atomic(path, categories, indent=4)
+    st = os.stat(path)
+    _categories_cache.update(key=(st.st_mtime_ns, st.st_size), list=categories,
+                             lower_set=frozenset(cat.lower() for cat in categories))
 
 @app.route('/add_category', methods=['POST'])
-@login_required
+@admin_required
 def add_category():
     """
     Add a new category to the system.
     """
-    print(f"DEBUG: add_category called. Session: {session}")
-    print(f"DEBUG: Current user: {current_user}, is_authenticated: {current_user.is_authenticated}")
-
-    if not is_admin(current_user):
-        print("DEBUG: Unauthorized access - user is not admin")
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
-    print(f"DEBUG: Request data: {data}")
+    app.logger.debug("add_category request data: %s", data)
 
     category_name = data.get('category_name', '').strip()
-    print(f"DEBUG: Category name: '{category_name}'")
 
     if not category_name:
-        print("DEBUG: Category name is required")
         return jsonify({'status': 'error', 'message': 'Category name is required'})
 
     # Logic to store the category in a JSON file
     app.logger.info(f"Attempting to add category: {category_name} by user: {current_user.email}")
-    app.logger.info(f"Request data: {data}")  # Log the request data for debugging
     # For now, let's assume we are storing it in a JSON file
     categories_path = os.path.join(app.root_path, 'database', 'categories.json')
-    print(f"DEBUG: Categories path: {categories_path}")
 
     try:
-        if os.path.exists(categories_path):
-            print("DEBUG: categories.json exists")
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories = json.load(f)
-        else:
-            print("DEBUG: categories.json does not exist, creating empty list")
-            categories = []
+        cached = _load_categories(categories_path)
 
         # Check for duplicates (case-insensitive)
-        if category_name.lower() in [cat.lower() for cat in categories]:
-            print(f"DEBUG: Category '{category_name}' already exists")
+        if category_name.lower() in cached['lower_set']:
             return jsonify({'status': 'error', 'message': 'Category already exists'})
 
-        categories.append(category_name)  # Add the new category to the list
+        categories = cached['list'] + [category_name]  # Add the new category to the list
         # Note: Category files are created automatically when rules are added to new categories
         # No need to create empty category files upfront
-        print(f"DEBUG: Adding category '{category_name}' to list: {categories}")
 
-        with open(categories_path, 'w', encoding='utf-8') as f:
-            json.dump(categories, f, indent=4)
-        print("DEBUG: Successfully wrote to categories.json")
+        _save_categories(categories_path, categories)
 
         # Add empty category to combined rule files
-        from database.user_database import rule_utils
         rule_utils.add_empty_category(category_name, user_type='both')
 
         # Add the new category to rule_utils CATEGORY_FILES dynamically
@@ -1523,18 +1981,14 @@ def add_category():
     except Exception as e:
         app.logger.error(f"Error adding category: {str(e)}")  # Log the error with details
         app.logger.error(f"Request data: {data}")  # Log the request data for debugging
-        print(f"DEBUG: Exception occurred: {str(e)}")
         return jsonify({'status': 'error', 'message': f'Failed to add category: {str(e)}. Please check the server logs for more details.'})
 
 @app.route('/remove_category', methods=['POST'])
-@login_required
+@admin_required
 def remove_category():
     """
     Remove a category from the system, including deleting associated rule files and updating all_*_rules.json files.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     data = request.get_json()
     category_name = data.get('category_name', '').strip()
 
@@ -1544,27 +1998,22 @@ def remove_category():
     categories_path = os.path.join(app.root_path, 'database', 'categories.json')
 
     try:
-        if os.path.exists(categories_path):
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                categories = json.load(f)
-        else:
-            categories = []
+        cached = _load_categories(categories_path)
 
         # Remove category if it exists (case-insensitive)
-        categories_lower = [cat.lower() for cat in categories]
-        if category_name.lower() not in categories_lower:
+        target = category_name.lower()
+        if target not in cached['lower_set']:
             return jsonify({'status': 'error', 'message': 'Category not found'})
 
         # Remove the category (case-insensitive)
-        index_to_remove = categories_lower.index(category_name.lower())
+        categories = list(cached['list'])
+        index_to_remove = next(i for i, cat in enumerate(categories) if cat.lower() == target)
         removed_category = categories.pop(index_to_remove)
 
         # Save updated categories
-        with open(categories_path, 'w', encoding='utf-8') as f:
-            json.dump(categories, f, indent=4)
+        _save_categories(categories_path, categories)
 
         # Remove category from all_user_rules.json and all_guest_rules.json
-        from database.user_database import rule_utils
         rule_utils.remove_category(removed_category, user_type='both')
 
         # Delete associated rule files
@@ -1579,6 +2028,7 @@ def remove_category():
         # Update chatbot rules in memory
         chatbot.rules = chatbot.get_rules()
         chatbot.guest_rules = chatbot.get_guest_rules()
+        _schedule_chatbot_reload('index')
 
         return jsonify({'status': 'success', 'message': f'Category {removed_category} removed successfully', 'redirect': url_for('admin_dashboard')})
     except Exception as e:
@@ -1586,137 +2036,84 @@ def remove_category():
         return jsonify({'status': 'error', 'message': f'Failed to remove category: {str(e)}'})
 
 @app.route('/get_categories', methods=['GET'])
-@login_required
+@admin_required
 def get_categories():
     """
     Get all categories from categories.json.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     categories_path = os.path.join(app.root_path, 'database', 'categories.json')
     try:
-        with open(categories_path, 'r', encoding='utf-8') as f:
-            categories = json.load(f)
+        categories = _load_categories(categories_path)['list']
         return jsonify({'status': 'success', 'categories': categories})
     except Exception as e:
         return jsonify({'status': 'error', 'message': f'Failed to load categories: {str(e)}'})
 
 @app.route('/create_category', methods=['POST'])
-@login_required
+@admin_required
 def create_category():
     """
     Create JSON files for a new category in both user and guest databases.
     """
-    print(f"DEBUG: create_category called. Session: {session}")
-    print(f"DEBUG: Current user: {current_user}, is_authenticated: {current_user.is_authenticated}")
-
-    if not is_admin(current_user):
-        print("DEBUG: Unauthorized access - user is not admin")
-        app.logger.error("Unauthorized access attempt to create category.")
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    print(f"DEBUG: Request data: {data}")
-
-    category = data.get('category', '').strip()
-    print(f"DEBUG: Category: '{category}'")
+    (category,) = _json_fields(_CREATE_CATEGORY_FIELDS)
+    app.logger.debug("create_category: %r", category)
 
     if not category:
-        print("DEBUG: Category name is required.")
         app.logger.error("Category name is required.")
         return jsonify({'status': 'error', 'message': 'Category name is required'})
 
     try:
         # Create category files using the chatbot's method
-        print(f"DEBUG: Calling chatbot.create_category_files('{category}')")
         chatbot.create_category_files(category)
         app.logger.info(f"Category files created for: {category}")
-        print(f"DEBUG: Category files created successfully for: {category}")
         return jsonify({'status': 'success', 'message': f'Category files created for {category}'})
     except Exception as e:
         app.logger.error(f"Error creating category files: {str(e)}")
-        print(f"DEBUG: Exception occurred in create_category_files: {str(e)}")
         return jsonify({'status': 'error', 'message': f'Failed to create category files: {str(e)}'})
 
 @app.route('/admin/feedback')
-@login_required
+@admin_page_required
 def admin_feedback():
     """
     Render the admin feedback page.
     """
-    from models import Feedback
-
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
-    feedbacks = Feedback.query.order_by(Feedback.timestamp.desc()).all()
+    page, per_page = _admin_pager()
+    # One extra row tells the template whether there is a next page
+    feedbacks = (Feedback.query.order_by(Feedback.timestamp.desc())
+                 .limit(per_page + 1).offset((page - 1) * per_page).all())
+    has_next = len(feedbacks) > per_page
+    feedbacks = feedbacks[:per_page]
 
     # Format timestamps for display
     for fb in feedbacks:
         fb.formatted_timestamp = fb.timestamp.strftime('%B %d, %Y')
 
-    return render_template('admin_feedback.html', feedbacks=feedbacks)
+    return render_template('admin_feedback.html', feedbacks=feedbacks,
+                           page=page, per_page=per_page, has_next=has_next)
 
 @app.route('/admin/feedback/mark_done', methods=['POST'])
-@login_required
+@admin_required
 def mark_feedback_done():
     """
-    Mark feedback as done: remove from DB, save to feedback.json, send email notification.
+    Mark feedback as done: move it to the FinishedFeedback table, send email notification.
     """
-    from models import Feedback
-
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    feedback_id = data.get('feedback_id')
+    (feedback_id,) = _json_fields(_MARK_FEEDBACK_FIELDS)
 
     if not feedback_id:
         return jsonify({'status': 'error', 'message': 'Feedback ID is required'})
 
-    feedback = Feedback.query.get(feedback_id)
-    if not feedback:
-        return jsonify({'status': 'error', 'message': 'Feedback not found'})
-
-    # Prepare feedback data to save
-    feedback_data = {
-        'id': feedback.id,
-        'user_id': feedback.user_id,
-        'message': feedback.message,
-        'timestamp': feedback.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-    }
-
-    # Path to feedback.json
-    feedback_json_path = os.path.join(app.root_path, 'database', 'feedback', 'feedback.json')
-
-    # Load existing feedbacks from JSON file
+    # Archive and remove the feedback in one transaction, copying the row
+    # server-side with INSERT ... SELECT instead of loading it first
     try:
-        if os.path.exists(feedback_json_path):
-            with open(feedback_json_path, 'r', encoding='utf-8') as f:
-                existing_feedbacks = json.load(f)
-        else:
-            existing_feedbacks = []
-    except Exception as e:
-        existing_feedbacks = []
-
-    # Append new feedback data
-    existing_feedbacks.append(feedback_data)
-
-    # Save back to JSON file
-    try:
-        with open(feedback_json_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_feedbacks, f, indent=4)
-    except Exception as e:
-        return jsonify({'status': 'error', 'message': f'Failed to save feedback to JSON: {str(e)}'})
-
-    # Remove feedback from DB
-    try:
-        db.session.delete(feedback)
+        moved = db.session.execute(_ARCHIVE_FEEDBACK, {'id': feedback_id}).rowcount
+        if not moved:
+            db.session.rollback()
+            return jsonify({'status': 'error', 'message': 'Feedback not found'})
+        db.session.execute(_DELETE_FEEDBACK, {'id': feedback_id})
         db.session.commit()
+        _invalidate_dashboard_counts()
     except Exception as e:
-        return jsonify({'status': 'error', 'message': f'Failed to delete feedback from DB: {str(e)}'})
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': f'Failed to mark feedback as done: {str(e)}'})
 
     # Commenting out email notification logic for now
     # Send email notification
@@ -1732,75 +2129,69 @@ def mark_feedback_done():
 
     return jsonify({'status': 'success'})
 
-@app.route('/admin/feedback/finished', methods=['GET'])
-@login_required
-def get_finished_feedback():
+# Last time expired finished feedback was purged
+_finished_feedback_purge = {'ts': None}
+
+def _purge_finished_feedback(cutoff, interval=3600.0):
     """
-    Return finished feedback loaded from feedback.json as JSON, filtering out feedback older than 30 days.
+    Delete finished feedback older than cutoff, at most once every interval seconds.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    feedback_json_path = os.path.join(app.root_path, 'database', 'feedback', 'feedback.json')
-
+    now = time.monotonic()
+    last = _finished_feedback_purge['ts']
+    if last is not None and now - last < interval:
+        return
     try:
-        if os.path.exists(feedback_json_path):
-            with open(feedback_json_path, 'r', encoding='utf-8') as f:
-                finished_feedback = json.load(f)
-        else:
-            finished_feedback = []
+        FinishedFeedback.query.filter(FinishedFeedback.timestamp <= cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        _finished_feedback_purge['ts'] = now
     except Exception as e:
-        app.logger.error(f"Failed to load finished feedback: {str(e)}")
-        finished_feedback = []
+        db.session.rollback()
+        app.logger.error(f"Failed to remove old finished feedback: {str(e)}")
 
-    # Filter out feedback older than 30 days
-    current_time = datetime.now()
-    thirty_days_ago = current_time - timedelta(days=30)
-    finished_feedback = [
-        fb for fb in finished_feedback
-        if datetime.strptime(fb['timestamp'], '%Y-%m-%d %H:%M:%S') > thirty_days_ago
-    ]
+@app.route('/admin/feedback/finished', methods=['GET'])
+@admin_required
+def get_finished_feedback():
+    """
+    Return finished feedback from the FinishedFeedback table as JSON, dropping feedback older than 30 days.
+    """
+    thirty_days_ago = datetime.now() - timedelta(days=30)
 
-    # Format timestamps for display
-    for fb in finished_feedback:
-        dt = datetime.strptime(fb['timestamp'], '%Y-%m-%d %H:%M:%S')
-        fb['timestamp'] = dt.strftime('%B %d, %Y')
+    # Expired rows are purged at most hourly; the SELECT below filters them out either way
+    _purge_finished_feedback(thirty_days_ago)
 
-    # Save the filtered feedback back to the file to remove old entries (keeping original format)
+    # Read the surviving rows once and format them for display in the same pass
     try:
-        # Reload and filter again for saving, without formatting
-        if os.path.exists(feedback_json_path):
-            with open(feedback_json_path, 'r', encoding='utf-8') as f:
-                all_feedback = json.load(f)
-        else:
-            all_feedback = []
-        filtered_for_save = [
-            fb for fb in all_feedback
-            if datetime.strptime(fb['timestamp'], '%Y-%m-%d %H:%M:%S') > thirty_days_ago
+        rows = db.session.execute(
+            select(FinishedFeedback.feedback_id, FinishedFeedback.user_id,
+                   FinishedFeedback.message, FinishedFeedback.timestamp)
+            .where(FinishedFeedback.timestamp > thirty_days_ago)
+            .order_by(FinishedFeedback.id)
+        )
+        finished_feedback = [
+            {
+                'id': feedback_id,
+                'user_id': user_id,
+                'message': message,
+                'timestamp': timestamp.strftime('%B %d, %Y')
+            }
+            for feedback_id, user_id, message, timestamp in rows
         ]
-        with open(feedback_json_path, 'w', encoding='utf-8') as f:
-            json.dump(filtered_for_save, f, indent=4)
     except Exception as e:
-        app.logger.error(f"Failed to save filtered feedback: {str(e)}")
+        app.logger.error(f"Failed to load finished feedback: {str(e)}")
+        finished_feedback = []
 
     return jsonify({'status': 'success', 'finished_feedback': finished_feedback})
 
 @app.route('/add_rule', methods=['POST'])
-@login_required
+@admin_required
 def add_rule():
     """
     Add a new chatbot rule via admin interface.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
     # Handle both form data and JSON data for backward compatibility
     if request.is_json:
-        data = request.get_json()
-        question = data.get('keywords', '')  # The form sends question as 'keywords' field
-        response = data.get('response', '')
-        user_type = data.get('user_type', 'user')
-        category = data.get('category', 'soict')
+        # The form sends the question as the 'keywords' field
+        question, response, user_type, category = _json_fields(_ADD_RULE_FIELDS)
     else:
         # Handle form data
         question = request.form.get('keywords', '').strip()
@@ -1820,23 +2211,19 @@ def add_rule():
         if result is None:
             return jsonify({'status': 'error', 'message': 'Failed to add rule to database'})
 
+        _schedule_chatbot_reload('index')
         return jsonify({'status': 'success'})
     except Exception as e:
         app.logger.error(f"Error adding rule: {str(e)}")
         return jsonify({'status': 'error', 'message': 'An error occurred while adding the rule'})
 
 @app.route('/delete_rule', methods=['POST'])
-@login_required
+@admin_required
 def delete_rule():
     """
     Delete a chatbot rule via admin interface.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    rule_id = data.get('rule_id')
-    user_type = data.get('user_type', 'user')
+    rule_id, user_type = _json_fields(_DELETE_RULE_FIELDS)
 
     if not rule_id:
         return jsonify({'status': 'error', 'message': 'Rule ID is required'})
@@ -1845,24 +2232,18 @@ def delete_rule():
     deleted = chatbot.delete_rule(rule_id, user_type)
 
     if deleted:
+        _schedule_chatbot_reload('index')
         return jsonify({'status': 'success', 'message': 'Rule deleted successfully'})
     else:
         return jsonify({'status': 'error', 'message': 'Rule not found or could not be deleted'})
 
 @app.route('/edit_rule', methods=['POST'])
-@login_required
+@admin_required
 def edit_rule():
     """
     Edit a chatbot rule via admin interface.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    rule_id = data.get('rule_id')
-    question = data.get('question', '')  # Updated to use 'question' instead of 'keywords'
-    response = data.get('response', '')
-    user_type = data.get('user_type', 'user')
+    rule_id, question, response, user_type = _json_fields(_EDIT_RULE_FIELDS)
 
     if not rule_id or not question or not response:
         return jsonify({'status': 'error', 'message': 'Rule ID, question, and response are required'})
@@ -1871,188 +2252,170 @@ def edit_rule():
     edited = chatbot.edit_rule(rule_id, question, response, user_type)
 
     if edited:
+        _schedule_chatbot_reload('index')
         return jsonify({'status': 'success', 'message': 'Rule updated successfully'})
     else:
         return jsonify({'status': 'error', 'message': 'Rule not found or could not be updated'})
 
-@app.route('/add_email', methods=['POST'])
-@login_required
-def add_email():
-    """
-    Add a new email entry to the email directory.
-    """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    school = data.get('school', '').strip()
-    email = data.get('email', '').strip()
-
-    if not school or not email:
-        return jsonify({'status': 'error', 'message': 'School and email are required'})
-
-    try:
-        email_id = email_directory.add_email(school, email)
-        return jsonify({'status': 'success', 'message': 'Email added successfully', 'id': email_id})
-    except Exception as e:
-        app.logger.error(f"Error adding email: {str(e)}")
-        return jsonify({'status': 'error', 'message': f'Failed to add email: {str(e)}'})
+# Email directory operations served by email_op, keyed by the action in the URL
+_EMAIL_ACTIONS = {
+    'add': {
+        'fields': _ADD_EMAIL_FIELDS,
+        'run': email_directory.add_email,
+        'required': 'School and email are required',
+        'done': 'Email added successfully',
+        'verb': 'adding',
+    },
+    'update': {
+        'fields': _UPDATE_EMAIL_FIELDS,
+        'run': email_directory.update_email,
+        'required': 'ID, school, and email are required',
+        'done': 'Email updated successfully',
+        'verb': 'updating',
+    },
+    'delete': {
+        'fields': _DELETE_EMAIL_FIELDS,
+        'run': email_directory.delete_email,
+        'required': 'ID is required',
+        'done': 'Email deleted successfully',
+        'verb': 'deleting',
+    },
+}
 
-@app.route('/update_email', methods=['POST'])
-@login_required
-def update_email():
+@app.route('/add_email', methods=['POST'], endpoint='add_email', defaults={'action': 'add'})
+@app.route('/update_email', methods=['POST'], endpoint='update_email', defaults={'action': 'update'})
+@app.route('/delete_email', methods=['POST'], endpoint='delete_email', defaults={'action': 'delete'})
+@app.route('/admin/emails/<action>', methods=['POST'])
+@admin_required
+def email_op(action):
     """
-    Update an existing email entry.
+    Add, update or delete an email directory entry, depending on action.
     """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    email_id = data.get('id')
-    school = data.get('school', '').strip()
-    email = data.get('email', '').strip()
+    spec = _EMAIL_ACTIONS.get(action)
+    if spec is None:
+        return jsonify({'status': 'error', 'message': f'Unknown email action: {action}'}), 404
 
-    if not email_id or not school or not email:
-        return jsonify({'status': 'error', 'message': 'ID, school, and email are required'})
+    values = _json_fields(spec['fields'])
+    if not all(values):
+        return jsonify({'status': 'error', 'message': spec['required']})
 
     try:
-        updated = email_directory.update_email(email_id, school, email)
-        if updated:
-            return jsonify({'status': 'success', 'message': 'Email updated successfully'})
-        else:
-            return jsonify({'status': 'error', 'message': 'Email not found'})
+        result = spec['run'](*values)
     except Exception as e:
-        app.logger.error(f"Error updating email: {str(e)}")
-        return jsonify({'status': 'error', 'message': f'Failed to update email: {str(e)}'})
-
-@app.route('/delete_email', methods=['POST'])
-@login_required
-def delete_email():
-    """
-    Delete an email entry from the directory.
-    """
-    if not is_admin(current_user):
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    data = request.get_json()
-    email_id = data.get('id')
+        app.logger.error(f"Error {spec['verb']} email: {str(e)}")
+        return jsonify({'status': 'error', 'message': f'Failed to {action} email: {str(e)}'})
 
-    if not email_id:
-        return jsonify({'status': 'error', 'message': 'ID is required'})
-
-    try:
-        deleted = email_directory.delete_email(email_id)
-        if deleted:
-            return jsonify({'status': 'success', 'message': 'Email deleted successfully'})
-        else:
-            return jsonify({'status': 'error', 'message': 'Email not found'})
-    except Exception as e:
-        app.logger.error(f"Error deleting email: {str(e)}")
-        return jsonify({'status': 'error', 'message': f'Failed to delete email: {str(e)}'})
+    # add returns the new id; update/delete return whether the entry existed
+    if result is False:
+        return jsonify({'status': 'error', 'message': 'Email not found'})
+    payload = {'status': 'success', 'message': spec['done']}
+    if action == 'add':
+        payload['id'] = result
+    return jsonify(payload)
 
 @app.route('/admin/login_logs')
-@login_required
+@admin_page_required
 def admin_login_logs():
     """
     Render the admin login logs page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
-    from models import LoginLog
-    login_logs = LoginLog.query.filter(LoginLog.user_type.in_(['user', 'guest'])).order_by(LoginLog.timestamp.desc()).all()
-
-    # Format timestamps for display
-    for log in login_logs:
-        log.formatted_timestamp = log.timestamp.strftime('%B %d, %Y %H:%M:%S')
+    page, per_page = _admin_pager()
+    # One extra row tells the template whether there is a next page
+    rows = db.session.execute(
+        select(LoginLog.id, LoginLog.user_type, LoginLog.identifier, LoginLog.timestamp)
+        .where(LoginLog.user_type.in_(['user', 'guest']))
+        .order_by(LoginLog.timestamp.desc())
+        .limit(per_page + 1).offset((page - 1) * per_page)
+    ).all()
+    has_next = len(rows) > per_page
+
+    # Plain rows with the display timestamp; the template reads the same attribute names
+    login_logs = [
+        {
+            'id': row.id,
+            'user_type': row.user_type,
+            'identifier': row.identifier,
+            'timestamp': row.timestamp,
+            'formatted_timestamp': row.timestamp.strftime('%B %d, %Y %H:%M:%S')
+        }
+        for row in rows[:per_page]
+    ]
 
-    return render_template('admin_login_logs.html', login_logs=login_logs)
+    return render_template('admin_login_logs.html', login_logs=login_logs,
+                           page=page, per_page=per_page, has_next=has_next)
 
 @app.route('/admin/login_logs/delete/<int:log_id>', methods=['DELETE'])
-@login_required
+@admin_required
 def delete_login_log(log_id):
     """
     Delete a login log entry.
     """
-    print(f"DEBUG: Delete route called for log_id: {log_id}")
-    if not is_admin(current_user):
-        print(f"DEBUG: Unauthorized access by user: {current_user}")
-        app.logger.warning(f"Unauthorized delete attempt by user: {current_user}")
-        return jsonify({'status': 'error', 'message': 'Unauthorized access'})
-
-    from models import LoginLog
-    log = LoginLog.query.get(log_id)
-    print(f"DEBUG: Log found: {log is not None}")
-    if not log:
-        print(f"DEBUG: Login log not found: ID {log_id}")
-        app.logger.warning(f"Login log not found: ID {log_id}")
-        return jsonify({'status': 'error', 'message': 'Log not found'})
-
-    print(f"DEBUG: Deleting login log: ID {log_id}, User Type: {log.user_type}, Identifier: {log.identifier}")
-    app.logger.info(f"Deleting login log: ID {log_id}, User Type: {log.user_type}, Identifier: {log.identifier}")
-
     try:
-        db.session.delete(log)
+        # Single DELETE round trip; login logs have no bearing on the chatbot rules,
+        # so nothing in memory needs reloading afterwards
+        result = db.session.execute(_DELETE_LOGIN_LOG, {'id': log_id})
+        if result.rowcount == 0:
+            db.session.rollback()
+            app.logger.warning(f"Login log not found: ID {log_id}")
+            return jsonify({'status': 'error', 'message': 'Log not found'})
         db.session.commit()
-        print(f"DEBUG: Successfully deleted login log: ID {log_id}")
-        app.logger.info(f"Successfully deleted login log: ID {log_id}")
-        # Update chatbot rules in memory
-        chatbot.rules = chatbot.get_rules()
-        chatbot.guest_rules = chatbot.get_guest_rules()
+        app.logger.info(f"Deleted login log: ID {log_id}")
         return jsonify({'status': 'success'})
     except Exception as e:
         db.session.rollback()
-        print(f"DEBUG: Error deleting login log: {str(e)}")
         app.logger.error(f"Error deleting login log: {str(e)}")
         return jsonify({'status': 'error', 'message': 'Failed to delete log'})
 
 @app.route('/admin/user_chat_history/<identifier>/<user_type>')
-@login_required
+@admin_page_required
 def admin_user_chat_history(identifier, user_type):
     """
     Render the admin user chat history page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
-    from models import ChatMessage
     if user_type == 'user':
-        # For users, find by email
-        from models import User
-        user = User.query.filter_by(email=identifier).first()
-        if user:
-            chat_messages = ChatMessage.query.filter_by(user_id=user.id).order_by(ChatMessage.timestamp.desc()).all()
-        else:
-            chat_messages = []
+        # For users, find by email (resolved inside the same statement)
+        owner = ChatMessage.user_id == select(UserModel.id).where(UserModel.email == identifier).scalar_subquery()
     elif user_type == 'guest':
         # For guests, find by guest_username
-        chat_messages = ChatMessage.query.filter_by(guest_username=identifier).order_by(ChatMessage.timestamp.desc()).all()
+        owner = ChatMessage.guest_username == identifier
     else:
-        chat_messages = []
-
-    # Group messages by session_id
-    chat_sessions = {}
-    for msg in chat_messages:
-        session_id = msg.session_id
-        if session_id not in chat_sessions:
-            chat_sessions[session_id] = []
-        chat_sessions[session_id].append(msg)
-
-    # Sort sessions by most recent message
-    sorted_sessions = sorted(chat_sessions.items(), key=lambda x: x[1][0].timestamp if x[1] else datetime.min, reverse=True)
-
-    return render_template('admin_user_chat_history.html', identifier=identifier, user_type=user_type, chat_sessions=sorted_sessions)
+        owner = None
+
+    page, per_page = _admin_pager()
+    chat_sessions = []
+    has_next = False
+    if owner is not None:
+        # Let the database order sessions by their most recent message, then each
+        # session's messages newest first, so one groupby pass builds the page.
+        # Pages step through whole sessions rather than individual messages, and
+        # one extra session tells the template whether there is a next page.
+        latest = (select(ChatMessage.session_id, func.max(ChatMessage.timestamp).label('latest'))
+                  .where(owner)
+                  .group_by(ChatMessage.session_id)
+                  .order_by(func.max(ChatMessage.timestamp).desc(), ChatMessage.session_id)
+                  .limit(per_page + 1).offset((page - 1) * per_page)
+                  .subquery())
+        # The owner columns are implied by the page, so only load what each message shows
+        chat_messages = (ChatMessage.query
+                         .options(load_only(ChatMessage.session_id, ChatMessage.sender_type,
+                                            ChatMessage.message, ChatMessage.timestamp))
+                         .join(latest, latest.c.session_id == ChatMessage.session_id)
+                         .filter(owner)
+                         .order_by(latest.c.latest.desc(), ChatMessage.session_id, ChatMessage.timestamp.desc())
+                         .all())
+        chat_sessions = [(session_id, list(msgs)) for session_id, msgs in groupby(chat_messages, key=attrgetter('session_id'))]
+        has_next = len(chat_sessions) > per_page
+        chat_sessions = chat_sessions[:per_page]
+
+    return render_template('admin_user_chat_history.html', identifier=identifier, user_type=user_type,
+                           chat_sessions=chat_sessions, page=page, per_page=per_page, has_next=has_next)
 
 @app.route('/submit_feedback', methods=['POST'])
 def submit_feedback():
     """
     Handle feedback submission from chat page and save to database.
     """
-    from models import Feedback
-    data = request.get_json()
-    message = data.get('message', '').strip()
+    (message,) = _json_fields(_FEEDBACK_FIELDS)
 
     if not message:
         return jsonify({'status': 'error', 'message': 'Feedback message is required'})
@@ -2064,6 +2427,7 @@ def submit_feedback():
         )
         db.session.add(feedback)
         db.session.commit()
+        _invalidate_dashboard_counts()
         return jsonify({'status': 'success', 'message': 'Feedback submitted successfully'})
     except Exception as e:
         app.logger.error(f"Error submitting feedback: {str(e)}")
@@ -2073,15 +2437,11 @@ def submit_feedback():
 
 
 @app.route('/admin/json_editor')
-@login_required
+@admin_page_required
 def admin_json_editor():
     """
     Render the admin JSON editor page.
     """
-    if not is_admin(current_user):
-        flash('Unauthorized access', 'danger')
-        return redirect(url_for('chat'))
-
     return render_template('admin_json_editor.html')
 
 
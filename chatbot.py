@@ -1,31 +1,59 @@
 import logging
-import string
 import re
-from uuid import uuid4
-import logging
-from nlp_utils import (
-    NLUEngine,
-    classify_intent,
-    preprocess_text
-)
+from collections import defaultdict, deque
+
+# Compiled once; these run for every query and every saved rule
+_TOKEN_RE = re.compile(r'\b[\w-]+\b')
+_IMG_SRC_RE = re.compile(r"<img src='([^']+)'")
 
 def simple_tokenize(text):
     """
     Simple tokenizer that converts text to lowercase and splits on non-alphanumeric characters, but keeps hyphens in words.
     """
-    return re.findall(r'\b[\w-]+\b', text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 import database.email_directory as email_directory
 import database.user_database.rule_utils as rule_utils
 
-import json
 import os
 
 from nlp_utils import NLUEngine
-from chatbot_models import Category, Faq, Location, Visual, UserRule, GuestRule
+from chatbot_models import Faq, Location, Visual, UserRule, GuestRule
 from extensions import db
+from sqlalchemy import bindparam, delete, select, update
+
+_FAQ_ROWS = select(Faq.id, Faq.question, Faq.answer)
+_USER_RULE_ROWS = select(UserRule.category, UserRule.question, UserRule.answer, UserRule.id)
+_GUEST_RULE_ROWS = select(GuestRule.category, GuestRule.question, GuestRule.answer, GuestRule.id)
+_LOCATION_ROWS = select(Location.id, Location.questions, Location.description, Location.urls, Location.user_type)
+_VISUAL_ROWS = select(Visual.id, Visual.questions, Visual.description, Visual.urls, Visual.user_type)
+_DELETE_GUEST_RULE = delete(GuestRule).where(GuestRule.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_USER_RULE = delete(UserRule).where(UserRule.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_LOCATION = delete(Location).where(Location.id == bindparam('id')).execution_options(synchronize_session=False)
+_DELETE_VISUAL = delete(Visual).where(Visual.id == bindparam('id')).execution_options(synchronize_session=False)
+_UPDATE_USER_RULE = (
+    update(UserRule)
+    .where(UserRule.id == bindparam('rule_id'))
+    .values(question=bindparam('new_question'), answer=bindparam('new_answer'))
+    .execution_options(synchronize_session=False)
+)
+_UPDATE_GUEST_RULE = (
+    update(GuestRule)
+    .where(GuestRule.id == bindparam('rule_id'))
+    .values(question=bindparam('new_question'), answer=bindparam('new_answer'))
+    .execution_options(synchronize_session=False)
+)
 
 class Chatbot:
+    # (rule list attribute, label, delete statement, loader), in the order delete_rule probes them;
+    # the loader is only needed when the in-memory list turns out to be behind the database
+    _RULE_TABLES = (
+        ("guest_rules", "guest rules", _DELETE_GUEST_RULE, "get_guest_rules"),
+        ("rules", "user rules", _DELETE_USER_RULE, "get_rules"),
+        ("location_rules", "location rules", _DELETE_LOCATION, "get_location_rules"),
+        ("visual_rules", "visual rules", _DELETE_VISUAL, "get_visual_rules"),
+    )
+
     def __init__(self):
 # Initialize NLP Engine FIRST
         self.nlu = NLUEngine(
@@ -64,33 +92,22 @@ class Chatbot:
         except Exception as e:
             logging.error(f"Error loading chatbot images: {e}")
             self.chatbot_images = []
+        self._image_lookup = self._build_image_lookup(self.chatbot_images)
 
         # Load location-based rules from MySQL Location table
-        try:
-            self.location_rules = self.get_location_rules()
-        except Exception as e:
-            logging.error(f"Error loading location rules: {e}")
-            self.location_rules = []
+        self._location_rows = None
+        self.reload_location_rules()
 
         # Load visual-based rules from MySQL Visual table
-        try:
-            self.visual_rules = self.get_visual_rules()
-        except Exception as e:
-            logging.error(f"Error loading visual rules: {e}")
-            self.visual_rules = []
+        self._visual_rows = None
+        self.reload_visual_rules()
 
         # Email keywords for triggering email search
         self.email_keywords = ["email", "contact", "mail", "reach", "address", "send", "message"]
 
         # Load FAQs from MySQL Faq table
-        try:
-            faqs_data = Faq.query.all()
-            self.faqs = [{"question": faq.question, "answer": faq.answer, "id": faq.id} for faq in faqs_data]
-            self.faq_rules = [{"question": faq["question"], "response": faq["answer"], "category": "faqs", "id": faq["id"]} for faq in self.faqs]
-        except Exception as e:
-            logging.error(f"Error loading FAQs: {e}")
-            self.faqs = []
-            self.faq_rules = []
+        self._faq_rows = None
+        self.reload_faqs()
 
         # Initialize fallback tracking attributes
         self.consecutive_fallbacks = 0
@@ -101,12 +118,22 @@ class Chatbot:
             "Apologies, I couldn't find an answer. Could you ask something else?"
         ]
 
-        # Initialize context tracking for conversation history
-        self.conversation_history = {}
+        # Initialize context tracking for conversation history; each session keeps
+        # only its last 10 exchanges, the deque evicting the oldest on append
+        self.conversation_history = defaultdict(lambda: deque(maxlen=10))
 
         # Initialize response cache for repeated queries
         self.response_cache = {}
 
+        # TF-IDF index over every rule, built on first use (see rule_index)
+        self._rule_index_cache = None
+
+        # {str(id): rule} per rule list attribute, built on first use (see rule_ids)
+        self._rule_id_maps = {}
+
+        # Lookup tables over the email directory, built on first use (see email_index)
+        self._email_index_cache = None
+
         # No longer precomputing TF-IDF for faster performance
 
         # Cache email directory for faster lookups
@@ -116,38 +143,83 @@ class Chatbot:
             logging.error(f"Error caching emails: {e}")
             self.cached_emails = []
 
-    def precompute_tfidf(self):
-        """
-        Precompute TF-IDF matrix for all rules to improve performance.
-        Now includes all questions for better accuracy and speed.
-        """
-        from nlp_utils import preprocess_text, tfidf_vectorizer
-        all_questions = []
-        for rule in self.rules + self.guest_rules + self.location_rules + self.visual_rules:
-            questions = rule.get('questions', []) or rule.get('question', '')
-            if isinstance(questions, str):
-                questions = [questions]
-            flattened_questions = []
-            for q in questions:
-                if isinstance(q, str):
-                    flattened_questions.append(q)
-                elif isinstance(q, list):
-                    flattened_questions.extend(q)
-            all_questions.extend(flattened_questions)
-        # Compute TF-IDF for all questions (no limit for better coverage)
-        self.tfidf_matrix = tfidf_vectorizer.fit_transform([preprocess_text(q) for q in all_questions])
-        self.tfidf_corpus = all_questions
+    def rule_index(self):
+        """
+        Return the NLU index over all rules, rebuilding it only when one of the rule
+        lists has been replaced (reloads assign new lists) or changed size.
+        """
+        sources = (self.rules, self.guest_rules, self.location_rules, self.visual_rules, self.faq_rules)
+        # Sizes are read before flattening, so a rule appended meanwhile triggers another rebuild
+        sizes = tuple(map(len, sources))
+        cached = self._rule_index_cache
+        if (cached is None
+                or any(a is not b for a, b in zip(sources, cached['sources']))
+                or sizes != cached['sizes']):
+            all_rules = [rule for rules in sources for rule in rules]
+            # Holding on to the source lists keeps their ids from being reused
+            cached = {
+                'sources': sources,
+                'sizes': sizes,
+                'index': self.nlu.build_rule_index(all_rules),
+            }
+            self._rule_index_cache = cached
+            # Cached answers were picked from the old rules
+            self.response_cache.clear()
+        return cached['index']
+
+    def rule_ids(self, attr):
+        """
+        Return {str(id): rule} for the rule list stored in attribute attr, rebuilt only
+        when that list has been replaced or changed size.
+        """
+        rules = getattr(self, attr)
+        cached = self._rule_id_maps.get(attr)
+        if cached is None or cached[0] is not rules or cached[1] != len(rules):
+            cached = (rules, len(rules), {str(rule.get("id")): rule for rule in rules})
+            self._rule_id_maps[attr] = cached
+        return cached[2]
 
     def cache_emails(self):
         """
         Cache the email directory for faster lookups.
         """
         try:
-            return email_directory.get_all_emails()
+            return email_directory.get_all_emails_cached()
         except Exception as e:
             logging.error(f"Error caching emails: {e}")
             return []
 
+    def email_index(self):
+        """
+        Return lookup tables over the cached email directory, rebuilt whenever the
+        directory cache hands back a new list. 'rows' memoizes, per query token, the
+        positions of the entries whose lowercased school name contains it.
+        """
+        all_emails = email_directory.get_all_emails_cached()
+        cached = self._email_index_cache
+        if cached is None or cached['emails'] is not all_emails:
+            schools = [entry['school'].lower() for entry in all_emails]
+            cached = {
+                'emails': all_emails,
+                'schools': schools,
+                'registrar': next((entry['email'] for entry, school in zip(all_emails, schools) if 'registrar' in school), None),
+                'rows': {},
+            }
+            self._email_index_cache = cached
+        return cached
+
+    def _email_rows_for(self, index, token):
+        """
+        Return the directory positions whose school name contains token, memoized per directory.
+        """
+        rows = index['rows'].get(token)
+        if rows is None:
+            rows = frozenset(i for i, school in enumerate(index['schools']) if token in school)
+            # Tokens come from user input, so only remember a bounded number of them
+            if len(index['rows']) < 4096:
+                index['rows'][token] = rows
+        return rows
+
     def recompute_embeddings(self):
         """
         No longer needed with NLTK-based similarity.
@@ -159,13 +231,12 @@ class Chatbot:
         Search the email directory for entries matching the user input.
         Returns a response string if matches are found, else None.
         """
-        tokens = simple_tokenize(user_input.lower())
-        has_email_keyword = any(keyword in tokens for keyword in self.email_keywords)
+        tokens = simple_tokenize(user_input)
 
         # Special case for "registrar data" to return full directory
         if "registrar" in tokens and "data" in tokens:
             try:
-                all_emails = email_directory.get_all_emails()
+                all_emails = email_directory.get_all_emails_cached()
             except Exception as e:
                 logging.error(f"Error fetching emails: {e}")
                 return None
@@ -176,26 +247,23 @@ class Chatbot:
                 response += f"- {entry['school']}: {entry['email']}\n"
             return response.strip()
 
-        # Get all emails
+        # Get all emails (cached; the directory rarely changes)
         try:
-            all_emails = email_directory.get_all_emails()
+            index = self.email_index()
         except Exception as e:
             logging.error(f"Error fetching emails: {e}")
             return None
 
         # Special case for registrar email
         if "registrar" in tokens:
-            for entry in all_emails:
-                if 'registrar' in entry['school'].lower():
-                    return entry['email']
-            return None
+            return index['registrar']
 
-        # Find matching schools/positions
-        matches = []
-        for entry in all_emails:
-            school_lower = entry['school'].lower()
-            if any(token in school_lower for token in tokens):
-                matches.append(entry)
+        # Find matching schools/positions, in directory order
+        all_emails = index['emails']
+        matched_rows = set()
+        for token in set(tokens):
+            matched_rows.update(self._email_rows_for(index, token))
+        matches = [all_emails[i] for i in sorted(matched_rows)]
 
         if not matches:
             return None
@@ -209,20 +277,21 @@ class Chatbot:
                 response += f"- {match['school']}: {match['email']}\n"
         return response.strip()
 
+    @staticmethod
+    def _load_rules(statement):
+        """
+        Build user/guest rules straight from (category, question, answer, id) rows,
+        without hydrating ORM objects; same shape as _rule_entry.
+        """
+        return [
+            {"category": category, "question": question, "response": answer, "id": rule_id}
+            for category, question, answer, rule_id in db.session.execute(statement)
+        ]
+
     def get_rules(self):
         # Load and return all user rules from MySQL UserRule table
         try:
-            user_rules = UserRule.query.all()
-            rules = []
-            for rule in user_rules:
-                rule_obj = {
-                    "category": rule.category,
-                    "question": rule.question,  # Using question field
-                    "response": rule.answer,
-                    "id": rule.id
-                }
-                rules.append(rule_obj)
-            return rules
+            return self._load_rules(_USER_RULE_ROWS)
         except Exception as e:
             logging.error(f"Error loading user rules from MySQL: {e}")
             return []
@@ -230,17 +299,7 @@ class Chatbot:
     def get_guest_rules(self):
         # Load and return all guest rules from MySQL GuestRule table
         try:
-            guest_rules = GuestRule.query.all()
-            rules = []
-            for rule in guest_rules:
-                rule_obj = {
-                    "category": rule.category,
-                    "question": rule.question,  # Using question field
-                    "response": rule.answer,
-                    "id": rule.id
-                }
-                rules.append(rule_obj)
-            return rules
+            return self._load_rules(_GUEST_RULE_ROWS)
         except Exception as e:
             logging.error(f"Error loading guest rules from MySQL: {e}")
             return []
@@ -259,13 +318,15 @@ class Chatbot:
                 return [str(k).lower() for k in keywords]
         return []
 
-    def get_location_rules(self):
+    def get_location_rules(self, locations_data=None):
         """
-        Load location-based rules from MySQL Location table.
+        Load location-based rules from MySQL Location table (or from rows of _LOCATION_ROWS
+        already fetched by the caller).
         Converts each location entry to a rule with questions and response containing description and all image URLs.
         """
         try:
-            locations_data = Location.query.all()
+            if locations_data is None:
+                locations_data = db.session.execute(_LOCATION_ROWS).all()
             location_rules = []
             for entry in locations_data:
                 questions = entry.questions or []
@@ -316,13 +377,15 @@ class Chatbot:
             logging.error(f"Error loading location rules from MySQL: {e}")
             return []
 
-    def get_visual_rules(self):
+    def get_visual_rules(self, visuals_data=None):
         """
-        Load visual-based rules from MySQL Visual table.
+        Load visual-based rules from MySQL Visual table (or from rows of _VISUAL_ROWS
+        already fetched by the caller).
         Converts each visual entry to a rule with questions and response containing description and all image URLs.
         """
         try:
-            visuals_data = Visual.query.all()
+            if visuals_data is None:
+                visuals_data = db.session.execute(_VISUAL_ROWS).all()
             visual_rules = []
             for entry in visuals_data:
                 questions = entry.questions or []
@@ -381,12 +444,7 @@ class Chatbot:
         """
         Update conversation history for context awareness.
         """
-        if session_id not in self.conversation_history:
-            self.conversation_history[session_id] = []
         self.conversation_history[session_id].append({'query': user_input, 'response': response})
-        # Keep only last 10 exchanges to avoid memory bloat
-        if len(self.conversation_history[session_id]) > 10:
-            self.conversation_history[session_id] = self.conversation_history[session_id][-10:]
 
     def get_response(self, user_input, user_role=None, session_id=None):
         """
@@ -405,29 +463,15 @@ class Chatbot:
     def get_response(self, user_input, user_role="guest", session_id=None):
 
             try:
-                # Cache key
-                cache_key = f"{user_role}:{user_input.lower().strip()}"
-                if cache_key in self.response_cache:
-                    return self.append_image_to_response(self.response_cache[cache_key])
+                # Cache key; matching searches the same rules for every role, so
+                # answers are shared across roles instead of cached once per role
+                cache_key = user_input.lower().strip()
 
-                # Detect intent
-                intent = classify_intent(user_input)
+                # Fetch the rule index before the cache: a rebuild drops answers cached from older rules
+                index = self.rule_index()
 
-                # Select rules
-                if user_role == "guest":
-                    rules_to_use = (
-                        self.guest_rules +
-                        self.location_rules +
-                        self.visual_rules +
-                        self.faq_rules
-                    )
-                else:
-                    rules_to_use = (
-                        self.rules +
-                        self.location_rules +
-                        self.visual_rules +
-                        self.faq_rules
-                    )
+                if cache_key in self.response_cache:
+                    return self.append_image_to_response(self.response_cache[cache_key])
 
                 # ---------------------------------------------------
                 # NEW NLP ENGINE REPLACEMENT BLOCK STARTS HERE
@@ -435,16 +479,8 @@ class Chatbot:
 
                 processed_query = self.nlu.preprocess(user_input)
 
-                # Combine all rules for unified search
-                all_rules = (
-                    self.rules +
-                    self.guest_rules +
-                    self.location_rules +
-                    self.visual_rules +
-                    self.faq_rules
-                )
-
-                best_rule, score = self.nlu.match_rule(processed_query, all_rules)
+                # Unified search over all rules, using the index kept between requests
+                best_rule, score = self.nlu.match_rule(processed_query, index["rules"], index)
 
                 if best_rule:
                     self.consecutive_fallbacks = 0
@@ -494,65 +530,106 @@ class Chatbot:
                 return fallback
 
 
+    def get_response_stream(self, user_input, user_role="guest", session_id=None):
+        """
+        Generate a response like get_response, but yield it in chunks split after each <br>
+        so callers can start sending the text before the whole response is serialized.
+        """
+        response = self.get_response(user_input, user_role=user_role, session_id=session_id)
+        start = 0
+        while True:
+            end = response.find("<br>", start)
+            if end == -1:
+                if start < len(response):
+                    yield response[start:]
+                return
+            end += len("<br>")
+            yield response[start:end]
+            start = end
+
     def append_image_to_response(self, response_text, rule_keywords=None):
         """
         Append a chatbot image as an HTML <img> tag to the response text if available and keywords match.
         Only append the chatbot image if keywords match chatbot image questions.
         Do not append chatbot image as a fallback for all responses.
         """
-        if self.chatbot_images and rule_keywords:
-            # Flatten rule_keywords if nested
-            flattened_keywords = []
-            if isinstance(rule_keywords, list):
-                for item in rule_keywords:
-                    if isinstance(item, list):
-                        flattened_keywords.extend(item)
-                    else:
-                        flattened_keywords.append(str(item))
-            else:
-                flattened_keywords = [str(rule_keywords)]
-            # Find an image whose questions contain any of the flattened_keywords
-            for image in self.chatbot_images:
-                image_questions = image.get("questions", [])
-                # Flatten image_questions if nested
-                flattened_image_questions = []
-                if isinstance(image_questions, list):
-                    for item in image_questions:
-                        if isinstance(item, list):
-                            flattened_image_questions.extend(item)
-                        else:
-                            flattened_image_questions.append(str(item))
-                else:
-                    flattened_image_questions = [str(image_questions)]
-                # Check if any keyword is in any question
-                match = any(any(kw.lower() in q.lower() for kw in flattened_keywords) for q in flattened_image_questions)
-                if match:
-                    image_url = image.get("url", "")
+        if self._image_lookup and rule_keywords:
+            # Flatten and lowercase rule_keywords once
+            keywords = [kw.lower() for kw in self._flatten_questions(rule_keywords)]
+            # Find the first image whose questions contain any of the keywords
+            for questions_text, image_url in self._image_lookup:
+                if any(kw in questions_text for kw in keywords):
                     if image_url:
-                        if not image_url.startswith("/static/"):
-                            image_url = "/static/" + image_url
                         response_text += f"<img src='{image_url}' alt='Chatbot Image' class='message-image'>"
                     break  # Append only one image
         return response_text
 
+    @staticmethod
+    def _flatten_questions(questions):
+        """
+        Flatten a possibly nested list of questions (or a single value) into strings.
+        """
+        if not isinstance(questions, list):
+            return [str(questions)]
+        flattened = []
+        for item in questions:
+            if isinstance(item, list):
+                flattened.extend(str(q) for q in item)
+            else:
+                flattened.append(str(item))
+        return flattened
+
+    @classmethod
+    def _build_image_lookup(cls, images):
+        """
+        Precompute, per chatbot image, its lowercased questions joined by NUL and its
+        /static/ url. A keyword without NUL is a substring of the joined text exactly
+        when it is a substring of one of the questions, so append_image_to_response
+        can test each image with one 'in' per keyword.
+        """
+        lookup = []
+        for image in images:
+            questions = cls._flatten_questions(image.get("questions", []))
+            if not questions:
+                continue  # No question can contain a keyword
+            image_url = image.get("url", "") or ""
+            if image_url and not image_url.startswith("/static/"):
+                image_url = "/static/" + image_url
+            lookup.append(("\0".join(questions).lower(), image_url))
+        return lookup
+
+    @staticmethod
+    def _rule_entry(category, question, response, rule_id):
+        """
+        Build an in-memory user/guest rule, shaped like the ones get_rules returns.
+        """
+        return {
+            "category": category,
+            "question": question,
+            "response": response,
+            "id": rule_id
+        }
+
     def add_rule(self, question, response, user_type='user', category='soict'):
         try:
             if user_type == 'user':
                 new_rule = UserRule(category=category, question=question, answer=response)
                 db.session.add(new_rule)
                 db.session.flush()  # Flush to generate the ID
+                rule_id = new_rule.id
                 db.session.commit()
-                # Reload rules to update in-memory state
-                self.rules = self.get_rules()
-                return {"user": new_rule.id}
+                # Append to the in-memory rules instead of reloading them all
+                self.rules.append(self._rule_entry(category, question, response, rule_id))
+                return {"user": rule_id}
             elif user_type == 'guest':
                 new_rule = GuestRule(category=category, question=question, answer=response)
                 db.session.add(new_rule)
                 db.session.flush()  # Flush to generate the ID
+                rule_id = new_rule.id
                 db.session.commit()
-                # Reload rules to update in-memory state
-                self.guest_rules = self.get_guest_rules()
-                return {"guest": new_rule.id}
+                # Append to the in-memory rules instead of reloading them all
+                self.guest_rules.append(self._rule_entry(category, question, response, rule_id))
+                return {"guest": rule_id}
             else:
                 # For both user types
                 user_rule = UserRule(category=category, question=question, answer=response)
@@ -560,11 +637,12 @@ class Chatbot:
                 db.session.add(user_rule)
                 db.session.add(guest_rule)
                 db.session.flush()  # Flush to generate the IDs
+                user_rule_id, guest_rule_id = user_rule.id, guest_rule.id
                 db.session.commit()
-                # Reload rules to update in-memory state
-                self.rules = self.get_rules()
-                self.guest_rules = self.get_guest_rules()
-                return {"user": user_rule.id, "guest": guest_rule.id}
+                # Append to the in-memory rules instead of reloading them all
+                self.rules.append(self._rule_entry(category, question, response, user_rule_id))
+                self.guest_rules.append(self._rule_entry(category, question, response, guest_rule_id))
+                return {"user": user_rule_id, "guest": guest_rule_id}
         except Exception as e:
             logging.error(f"Error adding rule to MySQL: {e}")
             db.session.rollback()
@@ -574,28 +652,19 @@ class Chatbot:
         """
         Save the current location rules to database/locations/locations.json.
         """
-        import json
         locations_path = os.path.join("database", "locations", "locations.json")
         try:
             # Convert location_rules to the format expected in locations.json
             locations_data = []
             for rule in self.location_rules:
-                # Extract image URL from response HTML if possible
-                import re
-                url_match = re.search(r"<img src='([^']+)'", rule.get("response", ""))
-                url = url_match.group(1) if url_match else ""
-                # Remove /static/ prefix if present
-                if url.startswith("/static/"):
-                    url = url[len("/static/"):]
+                response = rule.get("response", "")
+                # Extract image URLs from response HTML in one pass, removing the /static/ prefix;
+                # the first one is the primary url
+                urls = [img_url[len("/static/"):] if img_url.startswith("/static/") else img_url
+                        for img_url in _IMG_SRC_RE.findall(response)]
+                url = urls[0] if urls else ""
                 # Extract description (text before <br>)
-                description = rule.get("response", "").split("<br>")[0]
-                # Extract URLs from HTML
-                img_matches = re.findall(r"<img src='([^']+)'", rule.get("response", ""))
-                urls = []
-                for img_url in img_matches:
-                    if img_url.startswith("/static/"):
-                        img_url = img_url[len("/static/"):]
-                    urls.append(img_url)
+                description = response.partition("<br>")[0]
                 locations_data.append({
                     "id": rule.get("id", ""),
                     "questions": rule.get("questions", []),
@@ -604,35 +673,30 @@ class Chatbot:
                     "description": description,
                     "user_type": rule.get("user_type", "both")
                 })
-            with open(locations_path, "w", encoding="utf-8") as f:
-                logging.info("Saving location rules to %s", locations_path)
-                json.dump(locations_data, f, ensure_ascii=False, indent=4)
+            logging.info("Saving location rules to %s", locations_path)
+            # Encoded in one shot and written with a single write(); json.dump(indent=4)
+            # would stream thousands of small writes through the text layer
+            rule_utils.write_json_atomic(locations_path, locations_data, ensure_ascii=False, indent=4)
         except Exception as e:
-            import logging
             logging.error(f"Error saving location rules to {locations_path}: {e}")
 
     def save_visual_rules(self):
         """
         Save the current visual rules to database/visuals/visuals.json.
         """
-        import json
         visuals_path = os.path.join("database", "visuals", "visuals.json")
         try:
             # Convert visual_rules to the format expected in visuals.json
             visuals_data = []
             for rule in self.visual_rules:
-                # Extract image URLs from response HTML
-                import re
-                img_matches = re.findall(r"<img src='([^']+)'", rule.get("response", ""))
-                urls = []
-                for img_url in img_matches:
-                    if img_url.startswith("/static/"):
-                        img_url = img_url[len("/static/"):]
-                    urls.append(img_url)
+                response = rule.get("response", "")
+                # Extract image URLs from response HTML, removing the /static/ prefix
+                urls = [img_url[len("/static/"):] if img_url.startswith("/static/") else img_url
+                        for img_url in _IMG_SRC_RE.findall(response)]
                 # Primary url
                 url = urls[0] if urls else ""
                 # Extract description (text before <br>)
-                description = rule.get("response", "").split("<br>")[0]
+                description = response.partition("<br>")[0]
                 visuals_data.append({
                     "id": rule.get("id", ""),
                     "questions": rule.get("questions", []),
@@ -640,70 +704,34 @@ class Chatbot:
                     "urls": urls,
                     "description": description
                 })
-            with open(visuals_path, "w", encoding="utf-8") as f:
-                logging.info("Saving visual rules to %s", visuals_path)
-                json.dump(visuals_data, f, ensure_ascii=False, indent=4)
+            logging.info("Saving visual rules to %s", visuals_path)
+            rule_utils.write_json_atomic(visuals_path, visuals_data, ensure_ascii=False, indent=4)
         except Exception as e:
-            import logging
             logging.error(f"Error saving visual rules to {visuals_path}: {e}")
 
     def delete_rule(self, rule_id, user_type=None):
-        import logging
         logging.debug(f"Deleting rule with id: {rule_id}, user_type: {user_type}, type of rule_id: {type(rule_id)}")
 
-        # First try to delete from MySQL UserRule and GuestRule tables
-        try:
-            from chatbot_models import UserRule, GuestRule
-
-            # Try both tables regardless of user_type to ensure we find the rule
-            # Check guest rules
-            guest_rule = GuestRule.query.filter_by(id=rule_id).first()
-            if guest_rule:
-                db.session.delete(guest_rule)
-                db.session.commit()
-                self.guest_rules = self.get_guest_rules()
-                logging.debug(f"Rule with id {rule_id} deleted from guest rules in MySQL.")
-                return True
-
-            # Check user rules
-            user_rule = UserRule.query.filter_by(id=rule_id).first()
-            if user_rule:
-                db.session.delete(user_rule)
-                db.session.commit()
-                self.rules = self.get_rules()
-                logging.debug(f"Rule with id {rule_id} deleted from user rules in MySQL.")
-                return True
-
-        except Exception as e:
-            logging.error(f"Error deleting rule from MySQL: {e}")
-            db.session.rollback()
-            return False
-
-        # Check location rules in MySQL
-        try:
-            location = Location.query.filter_by(id=rule_id).first()
-            if location:
-                db.session.delete(location)
-                db.session.commit()
-                self.location_rules = self.get_location_rules()
-                logging.debug(f"Rule with id {rule_id} deleted from location rules in MySQL.")
-                return True
-        except Exception as e:
-            logging.error(f"Error deleting location rule from MySQL: {e}")
-            db.session.rollback()
-
-        # Check visual rules in MySQL
-        try:
-            visual = Visual.query.filter_by(id=rule_id).first()
-            if visual:
-                db.session.delete(visual)
-                db.session.commit()
-                self.visual_rules = self.get_visual_rules()
-                logging.debug(f"Rule with id {rule_id} deleted from visual rules in MySQL.")
-                return True
-        except Exception as e:
-            logging.error(f"Error deleting visual rule from MySQL: {e}")
-            db.session.rollback()
+        # Probe the list holding this id in memory first; the rest follow in the usual
+        # order (guest, user, location, visual) in case memory is behind the database
+        rule_key = str(rule_id)
+        tables = sorted(self._RULE_TABLES, key=lambda table: rule_key not in self.rule_ids(table[0]))
+        for attr, label, statement, loader in tables:
+            try:
+                if db.session.execute(statement, {"id": rule_id}).rowcount:
+                    db.session.commit()
+                    if rule_key in self.rule_ids(attr):
+                        # Drop the one rule from memory instead of reloading the whole list
+                        setattr(self, attr, [rule for rule in getattr(self, attr) if str(rule.get("id")) != rule_key])
+                    else:
+                        setattr(self, attr, getattr(self, loader)())
+                    logging.debug(f"Rule with id {rule_id} deleted from {label} in MySQL.")
+                    return True
+            except Exception as e:
+                logging.error(f"Error deleting rule from {label} in MySQL: {e}")
+                db.session.rollback()
+                if attr in ("guest_rules", "rules"):
+                    return False
 
         logging.debug(f"Rule with id {rule_id} not found in any database.")
         return False
@@ -712,21 +740,24 @@ class Chatbot:
         # Edit rule in MySQL database
         try:
             if user_type == 'user':
-                rule = UserRule.query.filter_by(id=rule_id).first()
-                if rule:
-                    rule.question = question
-                    rule.answer = response
-                    db.session.commit()
-                    self.rules = self.get_rules()
-                    return True
+                attr, statement, loader = "rules", _UPDATE_USER_RULE, self.get_rules
             elif user_type == 'guest':
-                rule = GuestRule.query.filter_by(id=rule_id).first()
-                if rule:
-                    rule.question = question
-                    rule.answer = response
-                    db.session.commit()
-                    self.guest_rules = self.get_guest_rules()
-                    return True
+                attr, statement, loader = "guest_rules", _UPDATE_GUEST_RULE, self.get_guest_rules
+            else:
+                return False
+            params = {"rule_id": rule_id, "new_question": question, "new_answer": response}
+            if db.session.execute(statement, params).rowcount:
+                db.session.commit()
+                rule = self.rule_ids(attr).get(str(rule_id))
+                if rule is not None:
+                    # Swap in an edited copy on a new list instead of reloading the whole
+                    # list. The live rule index still references the old dict, and the new
+                    # list makes rule_index() and rule_ids() rebuild on next use.
+                    edited = dict(rule, question=question, response=response)
+                    setattr(self, attr, [edited if r is rule else r for r in getattr(self, attr)])
+                else:
+                    setattr(self, attr, loader())
+                return True
         except Exception as e:
             logging.error(f"Error editing rule in MySQL: {e}")
             db.session.rollback()
@@ -737,54 +768,98 @@ class Chatbot:
         Reload FAQs from MySQL Faq table into memory.
         """
         try:
-            faqs_data = Faq.query.all()
-            self.faqs = [{"question": faq.question, "answer": faq.answer, "id": faq.id} for faq in faqs_data]
-            self.faq_rules = [{"question": faq["question"], "response": faq["answer"], "category": "faqs", "id": faq["id"]} for faq in self.faqs]
+            # Only the columns the rules need, straight from the rows
+            faqs_data = [tuple(row) for row in db.session.execute(_FAQ_ROWS)]
+            # Unchanged FAQs keep the same faq_rules list, so the rule index is not refit
+            if faqs_data == self._faq_rows:
+                return
+            self._faq_rows = faqs_data
+            self.faqs = [{"question": question, "answer": answer, "id": faq_id} for faq_id, question, answer in faqs_data]
+            self.faq_rules = [{"question": question, "response": answer, "category": "faqs", "id": faq_id} for faq_id, question, answer in faqs_data]
         except Exception as e:
             logging.error(f"Error reloading FAQs from MySQL: {e}")
+            self._faq_rows = None
             self.faqs = []
             self.faq_rules = []
 
     def reload_location_rules(self):
         """
-        Reload location rules from database/locations/locations.json into memory.
+        Reload location rules from MySQL Location table into memory, skipping the rebuild
+        when the rows are unchanged since the last reload.
         """
-        self.location_rules = self.get_location_rules()
+        try:
+            rows = db.session.execute(_LOCATION_ROWS).all()
+        except Exception as e:
+            logging.error(f"Error loading location rules from MySQL: {e}")
+            self._location_rows = None
+            self.location_rules = []
+            return
+        # Unchanged rows keep the same list, so neither the HTML nor the rule index is rebuilt
+        if rows == self._location_rows:
+            return
+        self._location_rows = rows
+        self.location_rules = self.get_location_rules(rows)
 
     def reload_visual_rules(self):
         """
-        Reload visual rules from MySQL Visual table into memory.
+        Reload visual rules from MySQL Visual table into memory, skipping the rebuild
+        when the rows are unchanged since the last reload.
         """
-        self.visual_rules = self.get_visual_rules()
+        try:
+            rows = db.session.execute(_VISUAL_ROWS).all()
+        except Exception as e:
+            logging.error(f"Error loading visual rules from MySQL: {e}")
+            self._visual_rows = None
+            self.visual_rules = []
+            return
+        if rows == self._visual_rows:
+            return
+        self._visual_rows = rows
+        self.visual_rules = self.get_visual_rules(rows)
 
     def create_category_files(self, category):
         """
         Create JSON files for a new category in both user and guest databases.
         """
-        import json
-        import os
+        self.create_category_files_bulk([category])
 
-        # Define paths
-        user_file = os.path.join("database", "user_database", f"{category}_rules.json")
-        guest_file = os.path.join("database", "guest_database", f"{category}_guest_rules.json")
+    def create_category_files_bulk(self, categories):
+        """
+        Create the user and guest JSON files for several new categories, then register
+        them in CATEGORY_FILES with a single update.
+        """
+        new_entries = {}
+        for category in categories:
+            # Define paths
+            user_file = os.path.join("database", "user_database", f"{category}_rules.json")
+            guest_file = os.path.join("database", "guest_database", f"{category}_guest_rules.json")
 
-        # Create empty category files if they don't exist
-        for file_path in [user_file, guest_file]:
-            if not os.path.exists(file_path):
+            # Create empty category files if they don't exist; O_EXCL makes the
+            # existence check and the create one open() call
+            for file_path in (user_file, guest_file):
+                try:
+                    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                except FileExistsError:
+                    continue
+                except Exception as e:
+                    logging.error(f"Error creating category file {file_path}: {e}")
+                    continue
                 try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump([], f, indent=4)
+                    os.write(fd, b"[]")
                 except Exception as e:
                     logging.error(f"Error creating category file {file_path}: {e}")
+                finally:
+                    os.close(fd)
 
-        # Update CATEGORY_FILES in rule_utils if needed
-        try:
-            from database.user_database import rule_utils
             if category not in rule_utils.CATEGORY_FILES:
-                rule_utils.CATEGORY_FILES[category] = {
+                new_entries[category] = {
                     "user": user_file,
                     "guest": guest_file
                 }
+
+        # Update CATEGORY_FILES in rule_utils if needed
+        try:
+            rule_utils.CATEGORY_FILES.update(new_entries)
         except Exception as e:
             logging.error(f"Error updating CATEGORY_FILES: {e}")
 
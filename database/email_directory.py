@@ -1,9 +1,20 @@
 import mysql.connector
 import os
+import time
 from urllib.parse import urlparse
+from sqlalchemy import bindparam, delete, update
 from chatbot_models import EmailDirectory
 from extensions import db
 
+# Single-statement update/delete by id, built once; rowcount says whether the entry existed
+_UPDATE_EMAIL = (update(EmailDirectory)
+                 .where(EmailDirectory.id == bindparam('entry_id'))
+                 .values(school=bindparam('school'), email=bindparam('email'))
+                 .execution_options(synchronize_session=False))
+_DELETE_EMAIL = (delete(EmailDirectory)
+                 .where(EmailDirectory.id == bindparam('entry_id'))
+                 .execution_options(synchronize_session=False))
+
 def get_db_config():
     """
     Get database configuration from environment variables.
@@ -40,11 +51,33 @@ def get_all_emails():
         print(f"Error fetching emails: {e}")
         return []
 
+# Directory snapshot shared by the chat page and the chatbot's email search;
+# add/update/delete below drop it so edits show up immediately
+_emails_cache = {'ts': 0.0, 'val': None}
+
+def get_all_emails_cached(ttl=60.0):
+    """
+    Return the email directory, refetching it at most once every ttl seconds.
+    The returned list is shared, so callers must not modify it.
+    """
+    now = time.monotonic()
+    if _emails_cache['val'] is None or now - _emails_cache['ts'] > ttl:
+        _emails_cache['val'] = get_all_emails()
+        _emails_cache['ts'] = now
+    return _emails_cache['val']
+
+def invalidate_emails_cache():
+    """
+    Drop the cached directory so the next read goes to the database.
+    """
+    _emails_cache['val'] = None
+
 def add_email(school, email):
     try:
         new_email = EmailDirectory(school=school, email=email)
         db.session.add(new_email)
         db.session.commit()
+        invalidate_emails_cache()
         return new_email.id
     except Exception as e:
         print(f"Error adding email: {e}")
@@ -53,13 +86,13 @@ def add_email(school, email):
 
 def update_email(id, school, email):
     try:
-        email_entry = EmailDirectory.query.get(id)
-        if email_entry:
-            email_entry.school = school
-            email_entry.email = email
-            db.session.commit()
-            return True
-        return False
+        result = db.session.execute(_UPDATE_EMAIL, {'entry_id': id, 'school': school, 'email': email})
+        if result.rowcount == 0:
+            db.session.rollback()
+            return False
+        db.session.commit()
+        invalidate_emails_cache()
+        return True
     except Exception as e:
         print(f"Error updating email: {e}")
         db.session.rollback()
@@ -67,12 +100,13 @@ def update_email(id, school, email):
 
 def delete_email(id):
     try:
-        email_entry = EmailDirectory.query.get(id)
-        if email_entry:
-            db.session.delete(email_entry)
-            db.session.commit()
-            return True
-        return False
+        result = db.session.execute(_DELETE_EMAIL, {'entry_id': id})
+        if result.rowcount == 0:
+            db.session.rollback()
+            return False
+        db.session.commit()
+        invalidate_emails_cache()
+        return True
     except Exception as e:
         print(f"Error deleting email: {e}")
         db.session.rollback()
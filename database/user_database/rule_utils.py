@@ -41,17 +41,33 @@ CATEGORY_FILES = {
 def load_combined_file(file_path):
     """Load the combined rules file"""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        # One read of the raw bytes; json.loads decodes UTF-8 itself, so this skips
+        # the text layer's chunked decode that json.load(f) goes through
+        with open(file_path, "rb") as f:
+            return json.loads(f.read())
     except (FileNotFoundError, json.JSONDecodeError):
         # Initialize with empty categories if file doesn't exist
         return {category: [] for category in CATEGORIES}
 
+def write_json_atomic(file_path, data, **dump_kwargs):
+    """Write data as JSON to a temp file next to file_path, fsync it, then swap it into place"""
+    # Readers see either the old file or the complete new one, never a truncated write
+    tmp_path = f"{file_path}.{uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "xb") as f:
+            f.write(json.dumps(data, **dump_kwargs).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
 def save_combined_file(file_path, data):
     """Save data to the combined rules file"""
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        write_json_atomic(file_path, data, indent=4, ensure_ascii=False)
     except Exception as e:
         logging.error(f"Error saving rules to {file_path}: {e}")
 
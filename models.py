@@ -10,7 +10,7 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     role = db.Column(db.String(20), nullable=False)
-    is_confirmed = db.Column(db.Boolean, default=False, nullable=False)
+    is_confirmed = db.Column(db.Boolean, default=False, nullable=False, index=True)
     created_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
 
     def set_password(self, password):
@@ -46,6 +46,11 @@ class ChatMessage(db.Model):
 
     user = db.relationship('User', backref=db.backref('chat_messages', lazy=True))
 
+    __table_args__ = (
+        db.Index('ix_chatmsg_user_ts', 'user_id', 'timestamp'),
+        db.Index('ix_chatmsg_guest_ts', 'guest_username', 'timestamp'),
+    )
+
 class EmailDirectory(db.Model):
     __tablename__ = 'email_directory'
     id = db.Column(db.Integer, primary_key=True)
@@ -57,13 +62,25 @@ class Feedback(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     message = db.Column(db.Text, nullable=False)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
 
     user = db.relationship('User', backref=db.backref('feedbacks', lazy=True))
 
+class FinishedFeedback(db.Model):
+    __tablename__ = 'finished_feedback'
+    id = db.Column(db.Integer, primary_key=True)
+    feedback_id = db.Column(db.Integer, nullable=False)  # id the feedback had before it was marked done
+    user_id = db.Column(db.Integer, nullable=True)
+    message = db.Column(db.Text, nullable=False)
+    timestamp = db.Column(db.DateTime, nullable=False, index=True)  # when the feedback was submitted
+
 class LoginLog(db.Model):
     __tablename__ = 'login_logs'
     id = db.Column(db.Integer, primary_key=True)
     user_type = db.Column(db.String(20), nullable=False)  # 'user', 'guest', 'admin'
     identifier = db.Column(db.String(120), nullable=False)  # username/email for users, username for guests, email for admins
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_loginlog_ut_ts', 'user_type', 'timestamp'),
+    )
@@ -18,10 +18,12 @@ API (short):
 """
 
 from typing import List, Tuple, Optional, Dict, Any
+from functools import lru_cache
 import re
 import os
 import pickle
 import math
+import numpy as np
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
@@ -46,13 +48,30 @@ DEFAULT_TFIDF_PARAMS = {
     "ngram_range": (1, 2),
     "min_df": 1,
     "max_df": 0.95,
+    # Rows come out unit-length, which lets _tfidf_match score with a plain dot product
+    "norm": "l2",
 }
 DEFAULT_SIMILARITY_THRESHOLD = 0.38
 DEFAULT_KEYWORD_THRESHOLD = 0.5
 
 
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
 def _simple_tokenize(text: str) -> List[str]:
-    return re.findall(r"\b\w+\b", text.lower())
+    return _WORD_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4096)
+def _spell_candidate(token: str) -> Optional[str]:
+    # Out-of-vocabulary tokens cost SpellChecker up to a second each (edit distance 2),
+    # and users keep sending the same acronyms and typos
+    return SPELL.correction(token)
+
+
+def _vocab_of(processed_questions: List[str]) -> frozenset:
+    """Every token of the preprocessed questions; built once per corpus for the spell-check step."""
+    return frozenset(t for s in processed_questions for t in s.split())
 
 
 def preprocess_text(text: str, remove_stopwords: bool = True) -> str:
@@ -119,6 +138,7 @@ class NLUEngine:
         self.fuzzy_threshold = fuzzy_threshold
         self.corpus: List[Dict[str, Any]] = []
         self.processed_questions: List[str] = []
+        self.corpus_vocab: frozenset = frozenset()
         self.vectorizer: Optional[TfidfVectorizer] = None
         self.tfidf_matrix = None
         self.keyword_rules: Dict[str, str] = {}
@@ -161,6 +181,7 @@ class NLUEngine:
         if tfidf_params is None:
             tfidf_params = DEFAULT_TFIDF_PARAMS
         self.processed_questions = [preprocess_text(q["question"]) for q in self.corpus]
+        self.corpus_vocab = _vocab_of(self.processed_questions)
         self.vectorizer = TfidfVectorizer(**tfidf_params)
         try:
             self.tfidf_matrix = self.vectorizer.fit_transform(self.processed_questions)
@@ -178,22 +199,30 @@ class NLUEngine:
                 pass
         return None
 
-    def _tfidf_match(self, processed_query: str, top_k: int = 1) -> Tuple[Optional[int], float]:
-        if self.vectorizer is None or self.tfidf_matrix is None:
+    def _tfidf_match(self, processed_query: str, top_k: int = 1, vectorizer=None, matrix=None, starts=None) -> Tuple[Optional[int], float]:
+        """With `starts` (first row of each group), scores and returns the best group instead of the best row."""
+        if vectorizer is None:
+            vectorizer, matrix = self.vectorizer, self.tfidf_matrix
+        if vectorizer is None or matrix is None:
             return None, 0.0
-        q_vec = self.vectorizer.transform([processed_query])
-        sims = cosine_similarity(q_vec, self.tfidf_matrix).flatten()
+        q_vec = vectorizer.transform([processed_query])
+        if vectorizer.norm == "l2":
+            # Query and corpus rows are unit-length, so cosine similarity is just the sparse dot product
+            sims = (matrix @ q_vec.T).toarray().ravel()
+        else:
+            sims = cosine_similarity(q_vec, matrix).flatten()
         if sims.size == 0:
             return None, 0.0
+        if starts is not None:
+            sims = np.maximum.reduceat(sims, starts)
         best_idx = int(sims.argmax())
         best_score = float(sims[best_idx])
         return best_idx, best_score
 
-    def _spell_correct_query(self, query: str) -> str:
+    def _spell_correct_query(self, query: str, corpus_vocab: Optional[frozenset] = None) -> str:
         tokens = _simple_tokenize(query)
-        corpus_vocab = set()
-        for s in self.processed_questions:
-            corpus_vocab.update(s.split())
+        if corpus_vocab is None:
+            corpus_vocab = self.corpus_vocab
 
         corrected = []
         for t in tokens:
@@ -203,7 +232,7 @@ class NLUEngine:
             if t in corpus_vocab:
                 corrected.append(t)
                 continue
-            cand = SPELL.correction(t)
+            cand = _spell_candidate(t)
             if not cand or cand == t:
                 corrected.append(t)
                 continue
@@ -214,12 +243,19 @@ class NLUEngine:
                 corrected.append(cand)
         return " ".join(corrected)
 
-    def _fuzzy_fallback(self, query: str) -> Tuple[Optional[int], float]:
+    def _fuzzy_fallback(self, query: str, processed_questions: Optional[List[str]] = None) -> Tuple[Optional[int], float]:
+        if processed_questions is None:
+            processed_questions = self.processed_questions
         qproc = preprocess_text(query)
         best_idx = None
         best_score = 0.0
-        for i, p in enumerate(self.processed_questions):
-            r = SequenceMatcher(None, qproc, p).ratio()
+        matcher = SequenceMatcher(None, qproc)
+        for i, p in enumerate(processed_questions):
+            matcher.set_seq2(p)
+            # The cheap upper bounds rule out most questions before the full ratio()
+            if matcher.real_quick_ratio() <= best_score or matcher.quick_ratio() <= best_score:
+                continue
+            r = matcher.ratio()
             if r > best_score:
                 best_score = r
                 best_idx = i
@@ -248,7 +284,7 @@ class NLUEngine:
                 reply = self.corpus[idx2]["answer"]
                 return (reply, score2) if return_confidence else reply
 
-        fidx, fscore = self._fuzzy_fallback(query)
+        fidx, fscore = self._fuzzy_fallback(query) if self.fuzzy_threshold <= 1.0 else (None, 0.0)
         if fidx is not None and fscore >= self.fuzzy_threshold:
             reply = self.corpus[fidx]["answer"]
             conf = max(0.0, min(1.0, (fscore - self.fuzzy_threshold) / (1 - self.fuzzy_threshold)))
@@ -260,51 +296,69 @@ class NLUEngine:
     def preprocess(self, text: str) -> str:
         return preprocess_text(text)
 
-    def match_rule(self, processed_query: str, rules: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
-        # Temporarily set corpus to rules for matching, flattening multiple questions
-        original_corpus = self.corpus[:]
-        corpus = []
+    def build_rule_index(self, rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Flatten the rules' questions into one corpus and fit a TF-IDF matrix over it."""
+        questions = []
         rule_index = []
+        rule_starts = []
         for i, r in enumerate(rules):
-            questions = r.get("questions") or [r.get("question") or r.get("q") or ""]
-            if isinstance(questions, str):
-                questions = [questions]
-            for q in questions:
-                corpus.append({"id": r.get("id"), "question": q, "answer": r.get("response", r.get("answer", "")), "meta": {}})
+            qs = r.get("questions") or [r.get("question") or r.get("q") or ""]
+            if isinstance(qs, str):
+                qs = [qs]
+            rule_starts.append(len(questions))
+            for q in qs:
+                questions.append(q)
                 rule_index.append(i)
-        self.corpus = corpus
-        self._prepare_vectorizer()
+        processed = [preprocess_text(q) for q in questions]
+        vocab = _vocab_of(processed)
+        vectorizer = TfidfVectorizer(**DEFAULT_TFIDF_PARAMS)
+        try:
+            matrix = vectorizer.fit_transform(processed)
+        except ValueError:
+            matrix = None
+        return {
+            "rules": rules,
+            "rule_index": rule_index,
+            "rule_starts": np.array(rule_starts, dtype=np.intp),
+            "processed_questions": processed,
+            "vocab": vocab,
+            "vectorizer": vectorizer,
+            "matrix": matrix,
+        }
 
-        idx, score = self._tfidf_match(processed_query)
+    def match_rule(self, processed_query: str, rules: List[Dict[str, Any]], index: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], float]:
+        # Match against a rule index of its own rather than swapping it into self.corpus,
+        # so the engine's own corpus never has to be refitted afterwards
+        if index is None:
+            index = self.build_rule_index(rules)
+        rule_index = index["rule_index"]
+        processed_questions = index["processed_questions"]
+        vectorizer, matrix = index["vectorizer"], index["matrix"]
+        # Every rule owns a contiguous, non-empty run of rows, so TF-IDF scores
+        # can be reduced to one max per rule
+        starts = index["rule_starts"]
+
+        idx, score = self._tfidf_match(processed_query, vectorizer=vectorizer, matrix=matrix, starts=starts)
         if idx is not None and score >= self.min_similarity:
-            rule = rules[rule_index[idx]]
-            # Restore original corpus
-            self.corpus = original_corpus
-            self._prepare_vectorizer()
-            return rule, score
+            return rules[idx], score
 
         # Spell correction
-        corrected = self._spell_correct_query(processed_query)
+        corrected = self._spell_correct_query(processed_query, index["vocab"])
         if corrected != processed_query:
             pquery2 = preprocess_text(corrected)
-            idx2, score2 = self._tfidf_match(pquery2)
-            if idx2 is not None and score2 >= self.min_similarity:
-                rule = rules[rule_index[idx2]]
-                self.corpus = original_corpus
-                self._prepare_vectorizer()
-                return rule, score2
-
-        # Fuzzy fallback
-        fidx, fscore = self._fuzzy_fallback(processed_query)
-        if fidx is not None and fscore >= self.fuzzy_threshold:
-            rule = rules[rule_index[fidx]]
-            self.corpus = original_corpus
-            self._prepare_vectorizer()
-            return rule, fscore
+            # A correction that preprocesses back to the same query would only repeat the miss above
+            if pquery2 != processed_query:
+                idx2, score2 = self._tfidf_match(pquery2, vectorizer=vectorizer, matrix=matrix, starts=starts)
+                if idx2 is not None and score2 >= self.min_similarity:
+                    return rules[idx2], score2
+
+        # Fuzzy fallback; SequenceMatcher ratios never exceed 1.0, so a higher
+        # threshold (e.g. a 0-100 style value) can never match and the pass is skipped
+        if self.fuzzy_threshold <= 1.0:
+            fidx, fscore = self._fuzzy_fallback(processed_query, processed_questions)
+            if fidx is not None and fscore >= self.fuzzy_threshold:
+                return rules[rule_index[fidx]], fscore
 
-        # Restore original corpus
-        self.corpus = original_corpus
-        self._prepare_vectorizer()
         return None, 0.0
 
     def add_keyword_rule(self, keyword: str, reply: str):
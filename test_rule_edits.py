@@ -0,0 +1,72 @@
+import pytest
+from flask import Flask
+
+from extensions import db
+from chatbot_models import GuestRule, UserRule
+from chatbot import Chatbot
+
+@pytest.fixture
+def bot():
+    """
+    A Chatbot over an in-memory SQLite chatbot_db holding one guest and one user rule
+    that share id 1.
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_BINDS'] = {'chatbot_db': 'sqlite://'}
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            GuestRule(id=1, category='soict', question='Where is the guest lounge?', answer='Guest lounge answer'),
+            UserRule(id=1, category='soict', question='Where is the faculty room?', answer='Faculty room answer'),
+        ])
+        db.session.commit()
+        yield Chatbot()
+        db.session.remove()
+
+def test_delete_reloads_when_id_is_only_in_database(bot):
+    # Rows written behind the chatbot's back are not in memory yet
+    db.session.add_all([
+        UserRule(id=50, category='soict', question='Where is the clinic?', answer='Clinic answer'),
+        UserRule(id=51, category='soict', question='Where is the canteen?', answer='Canteen answer'),
+    ])
+    db.session.commit()
+    before = bot.rules
+    assert '50' not in bot.rule_ids('rules')
+
+    assert bot.delete_rule(50) is True
+
+    assert db.session.get(UserRule, 50) is None
+    # The stale list was replaced by a reload, which also picked up row 51
+    assert bot.rules is not before
+    assert sorted(rule['id'] for rule in bot.rules) == [1, 51]
+
+def test_delete_prefers_guest_rule_on_shared_id(bot):
+    assert '1' in bot.rule_ids('guest_rules') and '1' in bot.rule_ids('rules')
+
+    assert bot.delete_rule(1) is True
+
+    assert db.session.get(GuestRule, 1) is None
+    assert db.session.get(UserRule, 1) is not None
+    assert bot.guest_rules == []
+    assert [rule['id'] for rule in bot.rules] == [1]
+
+def test_edit_does_not_leak_into_the_live_index(bot):
+    old_index = bot.rule_index()
+    old_query = bot.nlu.preprocess('Where is the faculty room?')
+    old_rule = bot.rules[0]
+
+    assert bot.edit_rule(1, 'How do I pay tuition?', 'Tuition answer', user_type='user') is True
+
+    # The index built before the edit still answers the old question with the old response
+    rule, _ = bot.nlu.match_rule(old_query, old_index['rules'], old_index)
+    assert rule is old_rule
+    assert rule['response'] == 'Faculty room answer'
+
+    # The edited rule lives on a new list, so the next lookup rebuilds the index
+    new_index = bot.rule_index()
+    assert new_index is not old_index
+    assert bot.rule_ids('rules')['1']['response'] == 'Tuition answer'
+    rule, _ = bot.nlu.match_rule(bot.nlu.preprocess('How do I pay tuition?'), new_index['rules'], new_index)
+    assert rule['response'] == 'Tuition answer'
@@ -0,0 +1,69 @@
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from nlp_utils import NLUEngine, preprocess_text
+
+RULES = [
+    {"id": 1, "questions": ["Where is the registrar office?", "How do I find the registrar?"],
+     "response": "The registrar is in Building A."},
+    # A single question, given the way user/guest rules carry it
+    {"id": 2, "question": "What is the email of the library?", "response": "library@example.edu"},
+    # Every question preprocesses to an empty string, but the rule still owns its rows
+    {"id": 3, "questions": ["the is a", "?"], "response": "Stopwords only."},
+    {"id": 4, "questions": ["When does enrollment open?", "Enrollment schedule for first year",
+                            "What are the enrollment requirements?"],
+     "response": "Enrollment opens in June."},
+]
+
+QUERIES = [
+    "registrar office location",
+    "library email",
+    "enrollment requirements",
+    "when is the enrollment schedule",
+]
+
+def reference_match(index, processed_query):
+    """
+    Score the query the straightforward way: cosine similarity against every
+    question, then the max over each rule's questions.
+    """
+    sims = cosine_similarity(index["vectorizer"].transform([processed_query]), index["matrix"]).ravel()
+    per_rule = np.zeros(len(index["rules"]))
+    for row, rule_pos in enumerate(index["rule_index"]):
+        per_rule[rule_pos] = max(per_rule[rule_pos], sims[row])
+    best = int(per_rule.argmax())
+    return best, float(per_rule[best])
+
+def test_every_rule_owns_a_non_empty_run():
+    nlu = NLUEngine()
+    index = nlu.build_rule_index(RULES)
+    starts = index["rule_starts"]
+    assert len(starts) == len(RULES)
+    ends = list(starts[1:]) + [len(index["rule_index"])]
+    for pos, (start, end) in enumerate(zip(starts, ends)):
+        assert end > start
+        assert index["rule_index"][start:end] == [pos] * (end - start)
+
+def test_reduceat_scores_match_per_rule_max():
+    nlu = NLUEngine()
+    index = nlu.build_rule_index(RULES)
+    for query in QUERIES:
+        processed = preprocess_text(query)
+        expected = reference_match(index, processed)
+        idx, score = nlu._tfidf_match(processed, vectorizer=index["vectorizer"],
+                                      matrix=index["matrix"], starts=index["rule_starts"])
+        assert idx == expected[0], query
+        assert np.isclose(score, expected[1]), query
+
+def test_match_rule_agrees_with_reference():
+    nlu = NLUEngine(min_similarity=0.35, fuzzy_threshold=80)
+    index = nlu.build_rule_index(RULES)
+    for query in QUERIES:
+        processed = preprocess_text(query)
+        best, best_score = reference_match(index, processed)
+        # Only queries that clear the TF-IDF threshold say anything about the fast path
+        assert best_score >= nlu.min_similarity, query
+        rule, score = nlu.match_rule(processed, RULES, index)
+        assert rule is RULES[best], query
+        assert np.isclose(score, best_score), query
+        assert rule["id"] != 3
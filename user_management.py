@@ -1,8 +1,9 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
 from flask_login import UserMixin
 import uuid
+from sqlalchemy import func
 from models import User as UserModel, Admin as AdminModel
 from extensions import db
 
@@ -101,7 +102,7 @@ class UserManager:
         Returns:
             UserModel or None: User object if found.
         """
-        return UserModel.query.get(int(user_id))
+        return self.db.session.get(UserModel, int(user_id))
     
     def get_user_by_email(self, email):
         """
@@ -154,7 +155,40 @@ class UserManager:
         """
         from models import ChatMessage
         messages = ChatMessage.query.filter_by(user_id=user_id).order_by(ChatMessage.timestamp.asc()).all()
+        return self._group_messages_by_session(messages)
 
+    def get_chat_history_for_date(self, user_id, selected_date):
+        """
+        Get a user's chat history for a single day grouped by session.
+
+        Args:
+            user_id (int): User ID.
+            selected_date (date): Day to load messages for.
+
+        Returns:
+            dict: Sessions with title and messages from that day.
+        """
+        from models import ChatMessage
+        day_start = datetime.combine(selected_date, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        # Range filter on the raw column so the (user_id, timestamp) index is used
+        messages = ChatMessage.query.filter(
+            ChatMessage.user_id == user_id,
+            ChatMessage.timestamp >= day_start,
+            ChatMessage.timestamp < day_end
+        ).order_by(ChatMessage.timestamp.asc()).all()
+        return self._group_messages_by_session(messages)
+
+    def _group_messages_by_session(self, messages):
+        """
+        Group chat messages (ordered by timestamp ascending) by session.
+
+        Args:
+            messages (list): ChatMessage objects.
+
+        Returns:
+            dict: Sessions with title and messages, most recent session first.
+        """
         sessions = {}
         for msg in messages:
             session_id = msg.session_id
@@ -169,7 +203,7 @@ class UserManager:
             sessions[session_id]['messages'].append({
                 'sender': msg.sender_type,
                 'message': msg.message,
-                'timestamp': msg.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                'timestamp': msg.timestamp.isoformat(sep=' ', timespec='seconds')
             })
         # Sort sessions by timestamp descending
         sorted_sessions = dict(sorted(sessions.items(), key=lambda x: x[1]['timestamp'], reverse=True))
@@ -224,7 +258,7 @@ class UserManager:
             session_data['messages'].append({
                 'sender': msg.sender_type,
                 'message': msg.message,
-                'timestamp': msg.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                'timestamp': msg.timestamp.isoformat(sep=' ', timespec='seconds')
             })
         return session_data
     
@@ -248,6 +282,15 @@ class UserManager:
         """
         return UserModel.query.filter_by(is_confirmed=False).all()
 
+    def count_pending_users(self):
+        """
+        Count users who are not confirmed yet without loading their rows.
+
+        Returns:
+            int: Number of pending users.
+        """
+        return self.db.session.query(func.count(UserModel.id)).filter(UserModel.is_confirmed.is_(False)).scalar()
+
     def confirm_user(self, user_id):
         """
         Confirm a user's account.